@@ -1,19 +1,32 @@
 import os
-from flask import Flask, request, jsonify
+import json
+import time
+import itertools
+import atexit
+import threading
+from collections import Counter
+from flask import Flask, Request, Response, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
 from flask_pymongo import PyMongo
 from flask_jwt_extended import JWTManager, create_access_token, get_jwt_identity, jwt_required
-from datetime import timedelta
-import google.generativeai as genai
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import logging
 
 # Import our modules
 from services.auth_service import AuthService
-from services.resume_parser import ResumeParser
+from services.parser_pool import ParserPool, ParserPoolBusy, parser_options_from_env
+from services.resume_parser import DocumentLimitExceeded
 from services.ml_analyzer import MLAnalyzer
 from services.gemini_service import GeminiService
 from services.data_visualizer import DataVisualizer
+from services.analysis_pipeline import AnalysisPipeline
+from services.result_cache import ResultCache
+from services.job_runner import (
+    AnalysisJobRunner, JobQueueFull, STATUS_QUEUED, STATUS_PROCESSING, STATUS_COMPLETED, STATUS_FAILED
+)
+from services.vector_index import ResumeVectorIndex
+from services.db_indexes import ensure_indexes
 
 # Load environment variables
 load_dotenv()
@@ -22,13 +35,38 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class UploadRequest(Request):
+    """Request whose body limit depends on the route: batch uploads carry several files"""
+    
+    @property
+    def max_content_length(self):
+        if self.endpoint == 'upload_resume_batch':
+            return MAX_BATCH_CONTENT_LENGTH
+        return super().max_content_length
+
 app = Flask(__name__)
+app.request_class = UploadRequest
 
 # Configuration
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
 app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'jwt-secret-change-in-production')
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=7)
 app.config['MONGO_URI'] = os.getenv('MONGO_URI', 'mongodb://localhost:27017/resume_builder_ml')
+# Request bodies are refused past these sizes before any of them is read; the slack covers
+# multipart framing and form fields around an upload of MAX_CONTENT_LENGTH bytes
+MAX_UPLOAD_BYTES = int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES + 64 * 1024 if MAX_UPLOAD_BYTES else None
+MAX_BATCH_CONTENT_LENGTH = int(os.getenv('MAX_BATCH_CONTENT_LENGTH', 100 * 1024 * 1024)) or None
+
+# Parser workers are forked here, before PyMongo starts its monitor threads and before any
+# other thread exists, so no child inherits a lock held by another thread
+parser_pool = ParserPool(
+    parser_options=parser_options_from_env(),
+    workers=int(os.getenv('PARSER_POOL_WORKERS', os.cpu_count() or 1)),
+    max_pending=int(os.getenv('PARSER_POOL_MAX_PENDING', 0)) or None,
+    parse_timeout=float(os.getenv('PARSER_POOL_PARSE_TIMEOUT', 120)) or None
+)
+parser_pool.start()
 
 # Initialize extensions
 CORS(app, origins=['http://localhost:3000', 'http://localhost:8080'])
@@ -37,19 +75,118 @@ jwt = JWTManager(app)
 
 # Initialize services
 auth_service = AuthService(mongo.db)
-resume_parser = ResumeParser()
 ml_analyzer = MLAnalyzer()
 gemini_service = GeminiService(os.getenv('GEMINI_API_KEY'))
-data_visualizer = DataVisualizer()
+result_cache = ResultCache(
+    mongo.db.analysis_cache,
+    ttl_seconds=int(os.getenv('ANALYSIS_CACHE_TTL_SECONDS', 30 * 24 * 3600)),
+    lru_size=int(os.getenv('ANALYSIS_CACHE_LRU_SIZE', 256))
+)
+visualization_cache = ResultCache(
+    mongo.db.visualization_cache,
+    ttl_seconds=int(os.getenv('ANALYSIS_CACHE_TTL_SECONDS', 30 * 24 * 3600)),
+    lru_size=int(os.getenv('VISUALIZATION_CACHE_LRU_SIZE', 64))
+)
+data_visualizer = DataVisualizer(
+    cache=visualization_cache,
+    wordcloud_format=os.getenv('WORDCLOUD_FORMAT', 'png'),
+    render_workers=int(os.getenv('VISUALIZATION_RENDER_WORKERS', 2))
+)
+resume_index = ResumeVectorIndex(
+    os.getenv('RESUME_INDEX_PATH', 'models/resume_index'),
+    flush_every=int(os.getenv('RESUME_INDEX_FLUSH_EVERY', 100))
+)
+analysis_pipeline = AnalysisPipeline(
+    parser_pool,
+    ml_analyzer,
+    gemini_service,
+    cache=result_cache,
+    ml_timeout=float(os.getenv('ML_STAGE_TIMEOUT', 30)),
+    gemini_timeout=float(os.getenv('GEMINI_STAGE_TIMEOUT', 60)),
+    ml_workers=int(os.getenv('ML_STAGE_WORKERS', 4)),
+    gemini_workers=int(os.getenv('GEMINI_STAGE_WORKERS', 8)),
+    vector_index=resume_index
+)
+job_runner = AnalysisJobRunner(
+    mongo.db.resume_analyses,
+    analysis_pipeline,
+    max_workers=int(os.getenv('ANALYSIS_JOB_WORKERS', 4)),
+    max_pending=int(os.getenv('ANALYSIS_JOB_MAX_PENDING', 64)),
+    runners=mongo.db.job_runners
+)
+MAX_BATCH_FILES = int(os.getenv('MAX_BATCH_FILES', 50))
+MAX_SYNC_BATCH_FILES = int(os.getenv('MAX_SYNC_BATCH_FILES', 5))
+HISTORY_PAGE_SIZE = 20
+MAX_HISTORY_PAGE_SIZE = 100
+
+def prepare_storage():
+    """Create the collection indexes and load the persisted matching index, rebuilding it when missing or stale"""
+    try:
+        ensure_indexes(mongo.db)
+    except Exception as e:
+        logger.error(f"Failed to create indexes: {str(e)}")
+    try:
+        # History pages sort and compare timestamps as dates; string timestamps sort apart from them
+        if mongo.db.resume_analyses.find_one({'timestamp': {'$type': 'string'}}, {'_id': 1}):
+            logger.warning("⚠️ Some analyses still store string timestamps and page out of order in history; "
+                           "run python migrate_timestamps.py")
+    except Exception as e:
+        logger.error(f"Failed to check analysis timestamps: {str(e)}")
+    result_cache.ensure_ttl_index()
+    visualization_cache.ensure_ttl_index()
+    try:
+        if not resume_index.load():
+            logger.info("Resume index not found, rebuilding from stored analyses")
+            resume_index.rebuild(mongo.db.resume_analyses)
+        elif resume_index.is_stale(mongo.db.resume_analyses):
+            logger.info("Resume index is out of date with stored analyses, rebuilding")
+            resume_index.rebuild(mongo.db.resume_analyses)
+    except Exception as e:
+        logger.error(f"Failed to prepare resume index: {str(e)}")
+
+def prewarm_services():
+    """Load heavy libraries, NLTK data and models in the background so the first upload is not slow"""
+    started_at = time.perf_counter()
+    services = [('ml', ml_analyzer), ('gemini', gemini_service), ('visualizer', data_visualizer)]
+    if parser_pool.inline:
+        services.insert(0, ('parser', parser_pool))
+    for name, service in services:
+        try:
+            service.prewarm()
+        except Exception as e:
+            logger.warning(f"Prewarming {name} failed: {str(e)}")
+    services_warm.set()
+    logger.info(f"✅ Services prewarmed in {time.perf_counter() - started_at:.2f}s")
+
+# Services import their heavy dependencies lazily; startup only spawns the background work
+services_warm = threading.Event()
+if os.getenv('PREWARM_SERVICES', 'true').lower() in ('1', 'true', 'yes'):
+    if not parser_pool.inline:
+        parser_pool.prewarm()
+    threading.Thread(target=prewarm_services, name='service-prewarm', daemon=True).start()
+# The first job heartbeat is written before any request is served; the heartbeat thread then fails
+# jobs left queued or processing by a previous run of this or another backend process
+job_runner.start()
+threading.Thread(target=prepare_storage, name='storage-setup', daemon=True).start()
+atexit.register(resume_index.flush)
 
 # Configure Google Gemini
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    logger.info("✅ Google Gemini API configured successfully")
+    logger.info("✅ Google Gemini API key configured")
 else:
     logger.warning("⚠️ GEMINI_API_KEY not found in environment variables")
 
+@app.before_request
+def reject_oversized_requests():
+    """Refuse bodies over the route's size limit before a view starts reading them"""
+    limit = request.max_content_length
+    if limit is not None and request.content_length is not None and request.content_length > limit:
+        return jsonify({
+            'success': False,
+            'message': f'Request body exceeds the {limit // (1024 * 1024)} MB limit'
+        }), 413
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -65,7 +202,7 @@ def health_check():
         'services': {
             'mongodb': mongo_status,
             'gemini_api': 'configured' if GEMINI_API_KEY else 'not configured',
-            'ml_models': 'ready'
+            'ml_models': 'ready' if services_warm.is_set() else 'loading on first use'
         },
         'features': [
             'Resume Parsing',
@@ -224,33 +361,45 @@ def upload_resume():
                 'message': 'No file selected'
             }), 400
         
+        # Job mode: hand the upload to a background worker and return immediately
+        if request.args.get('async', 'false').lower() in ('1', 'true', 'yes'):
+            if not parser_pool.parser.is_supported(file.filename):
+                return jsonify({
+                    'success': False,
+                    'message': 'Unsupported file format. Please upload PDF or DOCX files.'
+                }), 400
+            
+            upload = parser_pool.parser.read_upload(file)
+            try:
+                job_id = job_runner.submit(user_id, upload)
+            except Exception:
+                parser_pool.parser.release_upload(upload)
+                raise
+            
+            return jsonify({
+                'success': True,
+                'message': 'Resume queued for analysis',
+                'data': {
+                    'analysis_id': job_id,
+                    'status': STATUS_QUEUED,
+                    'status_url': f'/api/resume/analyze/{job_id}'
+                }
+            }), 202
+        
         # Parse resume
         logger.info(f"Parsing resume for user: {user_id}")
-        parsed_data = resume_parser.parse_resume(file)
+        parsed_data = analysis_pipeline.parse_resume(file)
         
         if not parsed_data['success']:
             return jsonify(parsed_data), 400
         
-        # Perform ML analysis
-        logger.info("Performing ML analysis")
-        ml_analysis = ml_analyzer.analyze_resume(parsed_data['data'])
-        
-        # Get Gemini AI analysis
-        logger.info("Getting Gemini AI analysis")
-        gemini_analysis = gemini_service.analyze_resume(parsed_data['data'])
-        
-        # Create comprehensive analysis
-        comprehensive_analysis = {
-            'user_id': user_id,
-            'parsed_data': parsed_data['data'],
-            'ml_analysis': ml_analysis,
-            'gemini_analysis': gemini_analysis,
-            'overall_score': calculate_overall_score(ml_analysis, gemini_analysis),
-            'timestamp': str(datetime.utcnow())
-        }
+        # Run ML and Gemini analysis
+        comprehensive_analysis = analysis_pipeline.analyze(user_id, parsed_data['data'])
+        comprehensive_analysis['status'] = STATUS_COMPLETED
         
         # Save to database
         analysis_id = mongo.db.resume_analyses.insert_one(comprehensive_analysis).inserted_id
+        analysis_pipeline.index_analysis(analysis_id, comprehensive_analysis)
         
         return jsonify({
             'success': True,
@@ -261,6 +410,20 @@ def upload_resume():
             }
         })
         
+    except (ParserPoolBusy, JobQueueFull) as e:
+        logger.warning(f"Resume upload rejected: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 503
+        
+    except DocumentLimitExceeded as e:
+        logger.warning(f"Resume upload rejected: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 413
+        
     except Exception as e:
         logger.error(f"Resume upload error: {str(e)}")
         return jsonify({
@@ -269,6 +432,182 @@ def upload_resume():
             'error': str(e)
         }), 500
 
+@app.route('/api/resume/upload/batch', methods=['POST'])
+@jwt_required()
+def upload_resume_batch():
+    """Upload and analyze several resumes in one request"""
+    parser = parser_pool.parser
+    uploads = []
+    try:
+        user_id = get_jwt_identity()
+        
+        files = [file for file in request.files.getlist('files') if file.filename]
+        if not files:
+            return jsonify({
+                'success': False,
+                'message': 'No files uploaded'
+            }), 400
+        
+        if len(files) > MAX_BATCH_FILES:
+            return jsonify({
+                'success': False,
+                'message': f'At most {MAX_BATCH_FILES} files can be uploaded per batch'
+            }), 400
+        
+        from bson import ObjectId
+        batch_id = str(ObjectId())
+        
+        # Per-file results in upload order; a rejected file does not fail the batch
+        results = [None] * len(files)
+        for position, file in enumerate(files):
+            if not parser.is_supported(file.filename):
+                results[position] = {
+                    'filename': file.filename,
+                    'success': False,
+                    'message': 'Unsupported file format. Please upload PDF or DOCX files.'
+                }
+                continue
+            
+            try:
+                uploads.append((position, parser.read_upload(file)))
+            except DocumentLimitExceeded as e:
+                results[position] = {
+                    'filename': file.filename,
+                    'success': False,
+                    'message': str(e)
+                }
+        
+        # Job mode: queue every file under one batch id and return immediately. Larger batches
+        # always run as jobs so they cannot tie up the analysis threads serving single uploads.
+        if (request.args.get('async', 'false').lower() in ('1', 'true', 'yes')
+                or len(uploads) > MAX_SYNC_BATCH_FILES):
+            job_ids = job_runner.submit_batch(user_id, [upload for _, upload in uploads], batch_id)
+            queued, uploads = uploads, []  # the job runner releases them from here on
+            
+            for (position, upload), job_id in zip(queued, job_ids):
+                results[position] = {
+                    'filename': upload['filename'],
+                    'success': True,
+                    'analysis_id': job_id,
+                    'status': STATUS_QUEUED,
+                    'status_url': f'/api/resume/analyze/{job_id}'
+                }
+            
+            return jsonify({
+                'success': True,
+                'message': f'{len(job_ids)} resumes queued for analysis',
+                'data': {
+                    'batch_id': batch_id,
+                    'status_url': f'/api/resume/batch/{batch_id}',
+                    'results': results
+                }
+            }), 202
+        
+        # Parse side by side, then one ML batch with concurrent Gemini calls and one bulk write
+        logger.info(f"Parsing {len(uploads)} resumes for user: {user_id}")
+        parsed = []
+        for (position, upload), parsed_data in zip(uploads, analysis_pipeline.parse_many([upload for _, upload in uploads])):
+            if parsed_data['success']:
+                parsed.append((position, upload['filename'], parsed_data['data']))
+            else:
+                results[position] = {
+                    'filename': upload['filename'],
+                    'success': False,
+                    'message': parsed_data.get('message')
+                }
+        
+        if parsed:
+            analyses = analysis_pipeline.analyze_many(user_id, [parsed_data for _, _, parsed_data in parsed])
+            for (_, filename, _), analysis in zip(parsed, analyses):
+                analysis.update(status=STATUS_COMPLETED, filename=filename, batch_id=batch_id)
+            
+            analysis_ids = mongo.db.resume_analyses.insert_many(analyses).inserted_ids
+            for (position, filename, _), analysis, analysis_id in zip(parsed, analyses, analysis_ids):
+                analysis_pipeline.index_analysis(analysis_id, analysis)
+                results[position] = {
+                    'filename': filename,
+                    'success': True,
+                    'analysis_id': str(analysis_id),
+                    'overall_score': analysis['overall_score'],
+                    'partial': analysis['partial']
+                }
+        
+        return jsonify({
+            'success': True,
+            'message': f'Analyzed {len(parsed)} of {len(files)} resumes',
+            'data': {
+                'batch_id': batch_id,
+                'results': results
+            }
+        })
+        
+    except (ParserPoolBusy, JobQueueFull) as e:
+        logger.warning(f"Resume batch rejected: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 503
+        
+    except Exception as e:
+        logger.error(f"Resume batch upload error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Resume batch analysis failed',
+            'error': str(e)
+        }), 500
+    
+    finally:
+        for _, upload in uploads:
+            parser.release_upload(upload)
+
+@app.route('/api/resume/batch/<batch_id>', methods=['GET'])
+@jwt_required()
+def get_batch_status(batch_id):
+    """Get the progress of a batch uploaded in job mode"""
+    try:
+        user_id = get_jwt_identity()
+        
+        analyses = list(mongo.db.resume_analyses.find(
+            {'batch_id': batch_id, 'user_id': user_id},
+            {'_id': 1, 'filename': 1, 'status': 1, 'overall_score': 1, 'message': 1}
+        ))
+        
+        if not analyses:
+            return jsonify({
+                'success': False,
+                'message': 'Batch not found'
+            }), 404
+        
+        counts = Counter(analysis.get('status', STATUS_COMPLETED) for analysis in analyses)
+        pending = counts[STATUS_QUEUED] + counts[STATUS_PROCESSING]
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'batch_id': batch_id,
+                'status': STATUS_PROCESSING if pending else STATUS_COMPLETED,
+                'counts': dict(counts),
+                'analyses': [
+                    {
+                        'analysis_id': str(analysis['_id']),
+                        'filename': analysis.get('filename'),
+                        'status': analysis.get('status', STATUS_COMPLETED),
+                        'overall_score': analysis.get('overall_score'),
+                        'message': analysis.get('message')
+                    }
+                    for analysis in analyses
+                ]
+            }
+        }), 202 if pending else 200
+        
+    except Exception as e:
+        logger.error(f"Batch status error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Failed to get batch status',
+            'error': str(e)
+        }), 500
+
 @app.route('/api/resume/analyze/<analysis_id>', methods=['GET'])
 @jwt_required()
 def get_analysis(analysis_id):
@@ -277,10 +616,21 @@ def get_analysis(analysis_id):
         user_id = get_jwt_identity()
         
         from bson import ObjectId
-        analysis = mongo.db.resume_analyses.find_one({
-            '_id': ObjectId(analysis_id),
-            'user_id': user_id
-        })
+        query = {'_id': ObjectId(analysis_id), 'user_id': user_id}
+        
+        # A completed analysis only changes when a retry bumps its revision, so a client holding
+        # the current ETag gets a 304 after a summary lookup, without loading the document or rendering
+        if request.if_none_match:
+            summary = mongo.db.resume_analyses.find_one(query, {'status': 1, 'revision': 1})
+            if summary and summary.get('status', STATUS_COMPLETED) == STATUS_COMPLETED:
+                etag = data_visualizer.etag(analysis_id, summary.get('revision', 0))
+                if request.if_none_match.contains(etag):
+                    response = Response(status=304)
+                    response.set_etag(etag)
+                    response.headers['Cache-Control'] = 'private, no-cache'
+                    return response
+        
+        analysis = mongo.db.resume_analyses.find_one(query)
         
         if not analysis:
             return jsonify({
@@ -288,16 +638,33 @@ def get_analysis(analysis_id):
                 'message': 'Analysis not found'
             }), 404
         
-        # Generate visualizations
-        visualizations = data_visualizer.create_resume_visualizations(analysis)
+        # Analyses submitted in job mode may still be running or may have failed
+        status = analysis.get('status', STATUS_COMPLETED)
+        if status != STATUS_COMPLETED:
+            return jsonify({
+                'success': status != STATUS_FAILED,
+                'message': analysis.get('message', f'Analysis is {status}'),
+                'data': {
+                    'analysis_id': analysis_id,
+                    'status': status,
+                    'error': analysis.get('error')
+                }
+            }), 202 if status != STATUS_FAILED else 200
         
-        return jsonify({
+        # Rendered once per analysis and visualizer version, then served from the cache
+        visualizations = data_visualizer.get_resume_visualizations(analysis_id, analysis)
+        
+        response = jsonify({
             'success': True,
             'data': {
                 'analysis': analysis,
                 'visualizations': visualizations
             }
         })
+        if data_visualizer.complete(visualizations):
+            response.set_etag(data_visualizer.etag(analysis_id, analysis.get('revision', 0)))
+            response.headers['Cache-Control'] = 'private, no-cache'
+        return response
         
     except Exception as e:
         logger.error(f"Get analysis error: {str(e)}")
@@ -307,26 +674,145 @@ def get_analysis(analysis_id):
             'error': str(e)
         }), 500
 
-@app.route('/api/resume/history', methods=['GET'])
+@app.route('/api/resume/analyze/<analysis_id>/retry', methods=['POST'])
 @jwt_required()
-def get_resume_history():
-    """Get user's resume analysis history"""
+def retry_analysis(analysis_id):
+    """Re-run the stages a partial analysis is missing (timed out or failed)"""
     try:
         user_id = get_jwt_identity()
         
-        analyses = list(mongo.db.resume_analyses.find(
-            {'user_id': user_id},
-            {'_id': 1, 'overall_score': 1, 'timestamp': 1}
-        ).sort('timestamp', -1))
+        from bson import ObjectId
+        query = {'_id': ObjectId(analysis_id), 'user_id': user_id}
+        analysis = mongo.db.resume_analyses.find_one(query)
+        
+        if not analysis:
+            return jsonify({
+                'success': False,
+                'message': 'Analysis not found'
+            }), 404
+        
+        status = analysis.get('status', STATUS_COMPLETED)
+        if status != STATUS_COMPLETED:
+            return jsonify({
+                'success': False,
+                'message': f'Analysis is {status}'
+            }), 409
+        
+        if analysis.get('incomplete_stages'):
+            rebuilt = analysis_pipeline.reanalyze(analysis)
+            # Matching on the revision read (None also matches a missing field) makes concurrent
+            # retries of one analysis store only one result
+            mongo.db.resume_analyses.update_one(
+                dict(query, revision=analysis.get('revision')),
+                {'$set': dict(rebuilt, revision=analysis.get('revision', 0) + 1)}
+            )
+            analysis = rebuilt
         
         return jsonify({
             'success': True,
+            'message': 'Analysis is partial, please retry shortly' if analysis['partial'] else 'Analysis complete',
             'data': {
-                'analyses': analyses,
-                'count': len(analyses)
+                'analysis_id': analysis_id,
+                'overall_score': analysis['overall_score'],
+                'partial': analysis['partial'],
+                'incomplete_stages': analysis['incomplete_stages']
             }
         })
         
+    except Exception as e:
+        logger.error(f"Retry analysis error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Failed to retry analysis',
+            'error': str(e)
+        }), 500
+
+@app.route('/api/visualizations/<path:filename>', methods=['GET'])
+def get_visualization_file(filename):
+    """Serve a rendered visualization image; file names are content hashes, so they never change"""
+    response = send_from_directory(
+        os.path.abspath(data_visualizer.output_dir),
+        filename,
+        max_age=365 * 24 * 3600
+    )
+    response.cache_control.immutable = True
+    return response
+
+@app.route('/api/resume/history', methods=['GET'])
+@jwt_required()
+def get_resume_history():
+    """Get a page of the user's resume analysis history, newest first
+
+    ?limit= sets the page size and ?after=<analysis_id> continues after that analysis
+    (the previous page's next_after).
+    """
+    try:
+        user_id = get_jwt_identity()
+        
+        from bson import ObjectId
+        from bson.errors import InvalidId
+        try:
+            limit = max(1, min(int(request.args.get('limit', HISTORY_PAGE_SIZE)), MAX_HISTORY_PAGE_SIZE))
+            after = ObjectId(request.args['after']) if request.args.get('after') else None
+        except (ValueError, InvalidId):
+            return jsonify({
+                'success': False,
+                'message': 'limit must be a number and after an analysis id'
+            }), 400
+        
+        query = {'user_id': user_id}
+        if after:
+            anchor = mongo.db.resume_analyses.find_one({'_id': after, 'user_id': user_id}, {'timestamp': 1})
+            if not anchor:
+                return jsonify({
+                    'success': False,
+                    'message': 'Analysis not found'
+                }), 404
+            
+            # Keyset: everything strictly after the anchor in (timestamp, _id) descending order
+            query['$or'] = [
+                {'timestamp': {'$lt': anchor['timestamp']}},
+                {'timestamp': anchor['timestamp'], '_id': {'$lt': anchor['_id']}}
+            ]
+        
+        # One document past the page tells whether another page follows
+        cursor = mongo.db.resume_analyses.find(
+            query,
+            {'_id': 1, 'overall_score': 1, 'timestamp': 1, 'filename': 1, 'status': 1}
+        ).sort([('timestamp', -1), ('_id', -1)]).limit(limit + 1)
+        
+        # Run the query before the response starts, so its errors still get a 500 below
+        first = next(cursor, None)
+        
+        def generate():
+            # success comes last: an error after the status line has gone out still ends the
+            # body as valid JSON with success false instead of truncating it
+            yield '{"data": {"analyses": ['
+            count = 0
+            next_after = None
+            try:
+                for analysis in itertools.chain([first] if first else [], cursor):
+                    if count == limit:
+                        next_after = last_id
+                        break
+                    last_id = str(analysis['_id'])
+                    yield (',' if count else '') + json.dumps({
+                        'analysis_id': last_id,
+                        'overall_score': analysis.get('overall_score'),
+                        'timestamp': analysis['timestamp'].isoformat() if isinstance(analysis.get('timestamp'), datetime) else analysis.get('timestamp'),
+                        'filename': analysis.get('filename'),
+                        'status': analysis.get('status', STATUS_COMPLETED)
+                    })
+                    count += 1
+            except Exception as e:
+                logger.error(f"Resume history stream error: {str(e)}")
+                yield f'], "count": {count}}}, "success": false, "message": "Failed to get resume history", "error": {json.dumps(str(e))}}}'
+                return
+            yield f'], "count": {count}, "next_after": {json.dumps(next_after)}}}, "success": true}}'
+        
+        # Rows are written as the cursor yields them instead of building the whole page first
+        return Response(stream_with_context(generate()), mimetype='application/json')
+        
     except Exception as e:
         logger.error(f"Resume history error: {str(e)}")
         return jsonify({
@@ -335,22 +821,79 @@ def get_resume_history():
             'error': str(e)
         }), 500
 
-def calculate_overall_score(ml_analysis, gemini_analysis):
-    """Calculate overall resume score from ML and Gemini analyses"""
+@app.route('/api/resume/match', methods=['POST'])
+@jwt_required()
+def match_job_description():
+    """Rank the user's stored resumes against a job description"""
     try:
-        ml_score = ml_analysis.get('overall_score', 0)
-        gemini_score = gemini_analysis.get('score', 0)
-        
-        # Weighted average (60% Gemini, 40% ML)
-        overall_score = (gemini_score * 0.6 + ml_score * 0.4)
-        return round(overall_score, 2)
-    except:
-        return 0
+        user_id = get_jwt_identity()
+        data = request.get_json() or {}
+        job_description = (data.get('job_description') or '').strip()
+        
+        if not job_description:
+            return jsonify({
+                'success': False,
+                'message': 'job_description is required'
+            }), 400
+        
+        try:
+            top_k = min(max(int(data.get('top_k', 10)), 1), 100)
+        except (TypeError, ValueError):
+            # null, lists and objects raise TypeError; non-numeric strings ValueError
+            return jsonify({
+                'success': False,
+                'message': 'top_k must be an integer'
+            }), 400
+        matches = resume_index.search(job_description, user_id, top_k)
+        
+        # Fetch only the summary fields of the ranked analyses
+        from bson import ObjectId
+        analyses = {
+            str(analysis['_id']): analysis
+            for analysis in mongo.db.resume_analyses.find(
+                {'_id': {'$in': [ObjectId(analysis_id) for analysis_id, _ in matches]}, 'user_id': user_id},
+                {
+                    'overall_score': 1,
+                    'parsed_data.personal_info.name': 1,
+                    'parsed_data.skills': 1,
+                    'ml_analysis.industry_classification.primary_industry': 1
+                }
+            )
+        }
+        
+        results = []
+        for analysis_id, similarity in matches:
+            analysis = analyses.get(analysis_id)
+            if not analysis:
+                continue  # deleted since it was indexed
+            
+            parsed_data = analysis.get('parsed_data', {})
+            results.append({
+                'analysis_id': analysis_id,
+                'similarity': similarity,
+                'overall_score': analysis.get('overall_score', 0),
+                'name': parsed_data.get('personal_info', {}).get('name'),
+                'skills': parsed_data.get('skills', []),
+                'primary_industry': analysis.get('ml_analysis', {}).get('industry_classification', {}).get('primary_industry')
+            })
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'matches': results,
+                'indexed_resumes': resume_index.count(user_id)
+            }
+        })
+        
+    except Exception as e:
+        logger.error(f"Job match error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Failed to match job description',
+            'error': str(e)
+        }), 500
 
 if __name__ == '__main__':
-    # Import datetime here to avoid circular imports
-    from datetime import datetime
-    
     # Create uploads directory
     os.makedirs('uploads', exist_ok=True)
     
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the Resume Builder Python Backend
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Per-call service logging would dominate the timings
+logging.getLogger('services').setLevel(logging.WARNING)
+
+SECTION_LINES = {
+    'summary': [
+        'Results-driven software engineer with {years} years of experience building data platforms.',
+        'Led cross-functional teams and improved delivery speed by {pct}% through automation.',
+        'Passionate about machine learning, cloud architecture and mentoring developers.'
+    ],
+    'experience': [
+        'Senior Software Engineer',
+        'Acme Analytics Inc. 2018 - present',
+        'Developed Python and Java microservices on AWS serving {people} people across the company.',
+        'Increased API throughput by {pct}% and reduced infrastructure cost by ${money} million.',
+        'Managed a team of {people} engineers and implemented CI/CD pipelines with Docker and Kubernetes.',
+        'Optimized PostgreSQL queries and designed a Kafka based event architecture.'
+    ],
+    'education': [
+        'Bachelor of Science in Computer Science',
+        'State University of Technology 2012 - 2016',
+        'Master of Science in Data Science, Institute of Analytics 2018'
+    ],
+    'skills': [
+        'Python, JavaScript, React, Node.js, SQL, MongoDB, TensorFlow, Pandas, NumPy, Docker',
+        'Leadership, Communication, Problem Solving, Agile, Scrum, Project Management'
+    ]
+}
+
+
+def synthetic_resume_text(pages=1, seed=0):
+    """Build a plausible resume of roughly the requested number of pages"""
+    rng = random.Random(seed)
+    lines = ['Jane Doe', 'jane.doe@example.com | +1 (555) 123-4567 | linkedin.com/in/janedoe']
+
+    for _ in range(pages):
+        for section in ['summary', 'experience', 'education', 'skills']:
+            lines.append(section.title())
+            for template in SECTION_LINES[section]:
+                lines.append(template.format(
+                    years=rng.randint(2, 20),
+                    pct=rng.randint(5, 90),
+                    people=rng.randint(3, 200),
+                    money=rng.randint(1, 9)
+                ))
+            lines.append('')
+
+    return '\n'.join(lines)
+
+
+def synthetic_parsed_resume(pages=1, seed=0):
+    """Build a parsed_data dict shaped like ResumeParser output without needing NLTK corpora"""
+    text = synthetic_resume_text(pages, seed)
+    return {
+        'raw_text': text,
+        'personal_info': {'name': 'Jane Doe', 'email': 'jane.doe@example.com', 'phone': '5551234567'},
+        'education': [
+            {'degree': 'Bachelor of Science in Computer Science', 'institution': 'State University', 'year': '2016'},
+            {'degree': 'Master of Science in Data Science', 'institution': 'Institute of Analytics', 'year': '2018'}
+        ],
+        'experience': [
+            {
+                'title': 'Senior Software Engineer',
+                'company': 'Acme Analytics Inc.',
+                'duration': '2018 - present',
+                'description': SECTION_LINES['experience'][2] + ' ' + SECTION_LINES['experience'][3]
+            }
+        ] * (2 * pages),
+        'skills': ['Python', 'JavaScript', 'React', 'Node.js', 'MongoDB', 'Docker', 'Leadership', 'Agile'],
+        'text_analysis': {'avg_sentence_length': 14.2, 'vocabulary_richness': 0.62},
+        'readability': {'flesch_reading_ease': 48.3, 'gunning_fog': 13.1},
+        'metrics': ['40 %', '3 years', '12 people']
+    }
+
+
+def synthetic_pdf(pages=1):
+    """Upload dict holding an in-memory PDF with one synthetic resume page per page"""
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_text((40, 40), synthetic_resume_text(1, seed=number), fontsize=6)
+    data = doc.tobytes()
+    doc.close()
+    return {'path': None, 'data': data}
+
+
+def synthetic_docx(pages=1):
+    """Upload dict holding a table-based DOCX template: name in the page header,
+    a sidebar and main column per page as the two cells of a layout table"""
+    import io
+    from docx import Document
+
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = 'Jordan Smith | jordan.smith@example.com | +1 555 010 0199'
+    for number in range(pages):
+        lines = synthetic_resume_text(1, seed=number).split('\n')
+        sidebar, main = doc.add_table(rows=1, cols=2).rows[0].cells
+        sidebar.text = '\n'.join(lines[:len(lines) // 3])
+        main.text = '\n'.join(lines[len(lines) // 3:])
+        doc.add_paragraph(f'Page {number + 1}')
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return {'path': None, 'data': buffer.getvalue()}
+
+
+def time_per_call(func, repeat):
+    """Return the mean wall-clock seconds per call over `repeat` runs"""
+    func()  # warm caches and lazy imports before timing
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+def bench_ml(args):
+    """Per-resume CPU time of MLAnalyzer.analyze_resume"""
+    from services.ml_analyzer import MLAnalyzer
+
+    analyzer = MLAnalyzer()
+    for pages in args.pages:
+        parsed = synthetic_parsed_resume(pages)
+        seconds = time_per_call(lambda: analyzer.analyze_resume(parsed), args.repeat)
+        logger.info(f"📊 analyze_resume, {pages:>2} page(s): {seconds * 1000:8.3f} ms/resume")
+
+
+def bench_ml_batch(args):
+    """Throughput of MLAnalyzer.analyze_batch against one analyze_resume call per document"""
+    from services.ml_analyzer import MLAnalyzer
+
+    analyzer = MLAnalyzer()
+    for pages in args.pages:
+        batch = [synthetic_parsed_resume(pages, seed) for seed in range(args.batch_size)]
+
+        started = time.perf_counter()
+        single = [analyzer.analyze_resume(parsed) for parsed in batch]
+        single_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        batched = analyzer.analyze_batch(batch)
+        batch_seconds = time.perf_counter() - started
+
+        status = '✅ identical' if single == batched else '❌ results differ'
+        logger.info(f"📊 {args.batch_size} resumes, {pages:>2} page(s): "
+                    f"{args.batch_size / single_seconds:8.0f}/s per-document, "
+                    f"{args.batch_size / batch_seconds:8.0f}/s batched ({status})")
+
+
+def bench_text_stats(args):
+    """Per-resume latency of text statistics plus readability for the NLTK/textstat and fast engines"""
+    from services.resume_parser import ResumeParser
+
+    engines = [('nltk', True), ('fast', True), ('fast', False)]
+    for pages in args.pages:
+        text = synthetic_resume_text(pages)
+        for engine, pos_tagging in engines:
+            parser = ResumeParser(text_stats_engine=engine, pos_tagging=pos_tagging)
+            label = f"{engine}{'' if pos_tagging else ' (no POS)'}"
+            try:
+                seconds = time_per_call(lambda: parser._analyze_text(text), args.repeat)
+            except LookupError:
+                logger.warning(f"⚠️ {label}: NLTK data is not installed, skipped")
+                continue
+            logger.info(f"📊 {label:<14} {pages:>2} page(s): {seconds * 1000:8.3f} ms/resume")
+
+
+def bench_extractors(args):
+    """Per-extractor latency of the regex-driven ResumeParser and MLAnalyzer steps"""
+    from services.resume_parser import ResumeParser
+    from services.ml_analyzer import MLAnalyzer
+
+    parser = ResumeParser()
+    analyzer = MLAnalyzer()
+    for pages in args.pages:
+        text = synthetic_resume_text(pages)
+        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        spans = parser._segment_sections(lines)
+        parsed = synthetic_parsed_resume(pages)
+        context = analyzer._build_context(parsed)
+
+        extractors = {
+            'personal_info': lambda: parser._extract_personal_info(text),
+            'sections': lambda: parser._segment_sections(lines),
+            'education': lambda: parser._extract_education(lines, spans),
+            'experience': lambda: parser._extract_experience(lines, spans),
+            'skills': lambda: parser._extract_skills(text),
+            'metrics': lambda: parser._extract_metrics(text),
+            'ml_quality_score': lambda: analyzer._calculate_quality_score(parsed, context)
+        }
+        for name, extractor in extractors.items():
+            seconds = time_per_call(extractor, args.repeat)
+            logger.info(f"📊 {name:<17} {pages:>2} page(s): {seconds * 1000:8.3f} ms")
+
+
+def bench_pdf(args):
+    """PDF text extraction: sequential, layout-aware blocks, and page ranges across processes"""
+    from services.resume_parser import ResumeParser
+
+    workers = min(4, os.cpu_count() or 1)
+    parsers = {
+        'sequential': ResumeParser(),
+        'layout blocks': ResumeParser(pdf_layout=True),
+        f'{workers} processes': ResumeParser(pdf_workers=workers, pdf_parallel_min_pages=1)
+    }
+    for pages in args.pages:
+        upload = synthetic_pdf(pages)
+        # Process start-up dominates small documents, so time fewer parallel runs
+        for label, parser in parsers.items():
+            repeat = max(1, args.repeat // 10) if parser.pdf_workers else args.repeat
+            seconds = time_per_call(lambda: parser._extract_text_from_pdf(upload), repeat)
+            logger.info(f"📊 {label:<14} {pages:>3} page(s): {seconds * 1000:8.3f} ms/document")
+
+
+def bench_docx(args):
+    """DOCX text extraction: python-docx paragraph concatenation against the streaming XML extractor"""
+    import io
+    from docx import Document
+    from services.resume_parser import ResumeParser
+
+    def paragraphs_only(upload):
+        # The extractor this benchmark replaced: body paragraphs only, string concatenation
+        text = ""
+        for paragraph in Document(io.BytesIO(upload['data'])).paragraphs:
+            text += paragraph.text + "\n"
+        return text
+
+    parser = ResumeParser(max_text_chars=0)
+    for pages in args.pages:
+        upload = synthetic_docx(pages)
+        for label, extract in [('python-docx', paragraphs_only), ('streaming', parser._extract_text_from_docx)]:
+            characters = len(extract(upload))
+            seconds = time_per_call(lambda: extract(upload), args.repeat)
+            logger.info(f"📊 {label:<12} {pages:>3} page(s): {seconds * 1000:8.3f} ms/document, "
+                        f"{characters:>7} characters")
+
+
+IMPORT_MODULES = [
+    'services.resume_parser',
+    'services.ml_analyzer',
+    'services.gemini_service',
+    'services.data_visualizer',
+    'services.vector_index',
+    'app'
+]
+
+
+def bench_imports(args):
+    """Cold import time of each service module and of app.py, in fresh interpreters"""
+    import subprocess
+
+    # Import app without forking parser workers or starting the prewarm thread
+    env = dict(os.environ, PREWARM_SERVICES='false', PARSER_POOL_WORKERS='0')
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+
+    for module in IMPORT_MODULES:
+        code = f"import time; s = time.perf_counter(); import {module}; print(time.perf_counter() - s)"
+        samples = []
+        for _ in range(3):
+            output = subprocess.run([sys.executable, '-c', code], cwd=backend_dir, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            samples.append(float(output.strip().splitlines()[-1]))
+        logger.info(f"📊 import {module:<26} {min(samples) * 1000:8.1f} ms")
+
+    # Largest top-level packages pulled in by app.py, from the interpreter's own import timer
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=backend_dir, env=env,
+                            capture_output=True, text=True, check=True).stderr
+    packages = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if '.' not in name.strip():
+            packages.append((int(cumulative), name.strip()))
+
+    for cumulative, name in sorted(packages, reverse=True)[:10]:
+        logger.info(f"📦 {name:<30} {cumulative / 1000:8.1f} ms cumulative")
+
+
+BENCHMARKS = {
+    'docx': bench_docx,
+    'extractors': bench_extractors,
+    'imports': bench_imports,
+    'ml': bench_ml,
+    'ml_batch': bench_ml_batch,
+    'pdf': bench_pdf,
+    'text_stats': bench_text_stats
+}
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description='Backend micro-benchmarks')
+    parser.add_argument('benchmarks', nargs='*', default=[],
+                        help=f"benchmarks to run: {', '.join(sorted(BENCHMARKS))} (default: all)")
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 5, 20], help='synthetic resume sizes in pages')
+    parser.add_argument('--repeat', type=int, default=50, help='timed iterations per measurement')
+    parser.add_argument('--batch-size', type=int, default=1000, help='documents per batch benchmark')
+    args = parser.parse_args()
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    for name in args.benchmarks or sorted(BENCHMARKS):
+        logger.info(f"🚀 Running {name} benchmark")
+        BENCHMARKS[name](args)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("\n🛑 Benchmark interrupted by user")
+        sys.exit(1)
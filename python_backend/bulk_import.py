@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Bulk import of archived PDF/DOCX resumes into resume_analyses
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from services.parser_pool import ParserPool, parser_options_from_env
+from services.ml_analyzer import MLAnalyzer
+from services.analysis_pipeline import calculate_overall_score, gemini_fallback
+from services.job_runner import STATUS_COMPLETED
+from services.db_indexes import ensure_indexes
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Per-file service logging would bury the progress lines
+logging.getLogger('services').setLevel(logging.WARNING)
+
+
+def find_resumes(directory, parser):
+    """Supported resume files below directory, in a stable order"""
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        paths.extend(os.path.join(root, name) for name in sorted(files) if parser.is_supported(name))
+    return paths
+
+
+def load_checkpoint(path):
+    """Files already handled by earlier runs (imported or failed)"""
+    if not os.path.exists(path):
+        return set()
+    with open(path) as checkpoint:
+        return {line.rstrip('\n').split('\t', 1)[1] for line in checkpoint if '\t' in line}
+
+
+def record_checkpoint(path, outcomes):
+    """Append (status, file) lines once their batch is written, so a rerun resumes after them"""
+    with open(path, 'a') as checkpoint:
+        checkpoint.writelines(f'{status}\t{file_path}\n' for status, file_path in outcomes)
+        checkpoint.flush()
+        os.fsync(checkpoint.fileno())
+
+
+def file_upload(path):
+    """Upload dict for a file on disk; workers read it by path, and it is never released (deleted)"""
+    return {
+        'filename': os.path.basename(path),
+        'size': os.path.getsize(path),
+        'sha256': None,
+        'data': None,
+        'path': path
+    }
+
+
+def import_batch(paths, args, parser_pool, ml_analyzer, gemini_service, collection, threads):
+    """Parse, analyze and insert one batch; returns (status, path) outcomes"""
+    uploads = []
+    outcomes = []
+    for path in paths:
+        if parser_pool.parser.max_upload_bytes and os.path.getsize(path) > parser_pool.parser.max_upload_bytes:
+            logger.warning(f"⚠️ {path}: larger than the upload limit, skipped")
+            outcomes.append(('failed', path))
+        else:
+            uploads.append(file_upload(path))
+
+    parsed_results = list(threads.map(parser_pool.parse_upload, uploads))
+    parsed = []
+    for upload, result in zip(uploads, parsed_results):
+        if result.get('success'):
+            parsed.append((upload['path'], result['data']))
+        else:
+            logger.warning(f"⚠️ {upload['path']}: {result.get('message')}")
+            outcomes.append(('failed', upload['path']))
+
+    if not parsed:
+        return outcomes
+
+    ml_analyses = ml_analyzer.analyze_batch([parsed_data for _, parsed_data in parsed])
+    if gemini_service:
+        gemini_analyses = list(threads.map(gemini_service.analyze_resume, [parsed_data for _, parsed_data in parsed]))
+    else:
+        # Same shape as a timed-out Gemini stage, so these analyses score like other partial ones
+        gemini_analyses = [gemini_fallback('gemini analysis skipped during bulk import') for _ in parsed]
+
+    timestamp = datetime.utcnow()
+    documents = []
+    for (path, parsed_data), ml_analysis, gemini_analysis in zip(parsed, ml_analyses, gemini_analyses):
+        documents.append({
+            'user_id': args.user_id,
+            'filename': os.path.basename(path),
+            'source_path': os.path.relpath(path, args.directory),
+            'parsed_data': parsed_data,
+            'ml_analysis': ml_analysis,
+            'gemini_analysis': gemini_analysis,
+            'overall_score': calculate_overall_score(ml_analysis, gemini_analysis),
+            'partial': gemini_service is None,
+            'incomplete_stages': [] if gemini_service else ['gemini'],
+            'status': STATUS_COMPLETED,
+            'timestamp': timestamp
+        })
+
+    # Upserts keyed on (source_path, user_id): a rerun after a crash between this write and
+    # the checkpoint finds the documents already there and leaves them alone
+    failed_rows = set()
+    try:
+        collection.bulk_write([
+            UpdateOne({'source_path': document['source_path'], 'user_id': document['user_id']},
+                      {'$setOnInsert': document}, upsert=True)
+            for document in documents
+        ], ordered=False)
+    except BulkWriteError as e:
+        failed_rows = {error['index'] for error in e.details.get('writeErrors', [])}
+        logger.error(f"❌ {len(failed_rows)} documents of the batch were not written")
+
+    for row, (path, _) in enumerate(parsed):
+        outcomes.append(('failed' if row in failed_rows else 'imported', path))
+    return outcomes
+
+
+def main():
+    """Main import function"""
+    parser = argparse.ArgumentParser(description='Parse, analyze and store a directory of resumes')
+    parser.add_argument('directory', help='directory searched recursively for PDF/DOCX resumes')
+    parser.add_argument('--user-id', default=None, help='user_id stored on the imported analyses')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='parser processes (0 = inline)')
+    parser.add_argument('--batch-size', type=int, default=200, help='resumes per ML batch and insert_many')
+    parser.add_argument('--gemini', action='store_true', help='also run the Gemini analysis (slow, rate limited)')
+    parser.add_argument('--checkpoint', default=None,
+                        help='file recording handled resumes (default: bulk_import.checkpoint in the directory)')
+    parser.add_argument('--limit', type=int, default=0, help='maximum resumes to import this run (0 = all)')
+    args = parser.parse_args()
+
+    args.directory = os.path.abspath(args.directory)
+    checkpoint_path = os.path.abspath(args.checkpoint or os.path.join(args.directory, 'bulk_import.checkpoint'))
+
+    # Resolve models/ and .env relative to the backend directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    load_dotenv()
+
+    # Parse with the backend's settings; workers are forked before MongoClient starts its monitor threads
+    parser_pool = ParserPool(parser_options=parser_options_from_env(), workers=args.workers,
+                             max_pending=args.batch_size, submit_timeout=None)
+    parser_pool.start()
+
+    client = MongoClient(os.getenv('MONGO_URI', 'mongodb://localhost:27017/resume_builder_ml'))
+    db = client.get_default_database()
+    collection = db.resume_analyses
+    # The unique source_path index backs the idempotent upserts
+    ensure_indexes(db)
+
+    ml_analyzer = MLAnalyzer()
+    gemini_service = None
+    if args.gemini:
+        from services.gemini_service import GeminiService
+        gemini_service = GeminiService(os.getenv('GEMINI_API_KEY'))
+
+    handled = load_checkpoint(checkpoint_path)
+    paths = [path for path in find_resumes(args.directory, parser_pool.parser) if path not in handled]
+    if args.limit:
+        paths = paths[:args.limit]
+    logger.info(f"📄 {len(paths)} resumes to import ({len(handled)} already handled per {checkpoint_path})")
+
+    parser_pool.prewarm()
+    started = time.perf_counter()
+    done = imported = 0
+    try:
+        with ThreadPoolExecutor(max_workers=args.batch_size) as threads:
+            for start in range(0, len(paths), args.batch_size):
+                outcomes = import_batch(paths[start:start + args.batch_size], args, parser_pool,
+                                        ml_analyzer, gemini_service, collection, threads)
+                record_checkpoint(checkpoint_path, outcomes)
+
+                done += len(outcomes)
+                imported += sum(1 for status, _ in outcomes if status == 'imported')
+                rate = done / (time.perf_counter() - started)
+                logger.info(f"📊 {done}/{len(paths)} processed, {imported} imported, {done - imported} failed, "
+                            f"{rate:.1f} resumes/s, ETA {(len(paths) - done) / rate / 60:.1f} min")
+    finally:
+        parser_pool.shutdown()
+
+    logger.info(f"✅ Imported {imported} of {done} resumes in {time.perf_counter() - started:.0f}s")
+    # The index belongs to the backend, which rebuilds it on startup once it no longer matches the collection
+    logger.info("💡 Restart the backend to rebuild the job-matching index with the imported resumes")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("\n🛑 Import interrupted by user; rerun to resume from the checkpoint")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"❌ Import failed with error: {e}")
+        sys.exit(1)
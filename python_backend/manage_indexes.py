@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Create the MongoDB indexes used by the backend and check service query plans
+"""
+
+import os
+import sys
+import logging
+import argparse
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+from services.db_indexes import ensure_indexes, explain_service_queries
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main index management function"""
+    parser = argparse.ArgumentParser(description='Create backend indexes and check query plans')
+    parser.add_argument('--check', action='store_true',
+                        help='explain every service query and fail if any scans a whole collection')
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    load_dotenv()
+
+    client = MongoClient(os.getenv('MONGO_URI', 'mongodb://localhost:27017/resume_builder_ml'))
+    db = client.get_default_database()
+
+    if not args.check:
+        names = ensure_indexes(db)
+        logger.info(f"✅ Indexes in place: {', '.join(names)}")
+        return
+
+    scans = 0
+    for name, collection_name, stages in explain_service_queries(db):
+        if 'COLLSCAN' in stages:
+            scans += 1
+            logger.error(f"❌ {name} ({collection_name}): {' <- '.join(stages)}")
+        else:
+            logger.info(f"✅ {name} ({collection_name}): {' <- '.join(stages)}")
+
+    if scans:
+        logger.error(f"❌ {scans} service queries scan whole collections; run manage_indexes.py without --check")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("\n🛑 Interrupted by user")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"❌ Index management failed with error: {e}")
+        sys.exit(1)
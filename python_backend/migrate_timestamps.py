@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Convert string timestamps of stored resume analyses to BSON datetimes
+"""
+
+import os
+import sys
+import logging
+import argparse
+from datetime import datetime
+from dotenv import load_dotenv
+from pymongo import MongoClient, UpdateOne
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Written as str(datetime.utcnow()) before analyses stored real datetimes
+TIMESTAMP_FIELDS = ['timestamp', 'completed_at']
+
+
+def migrate(collection, batch_size=1000):
+    """Rewrite string timestamp fields in _id order; returns (converted, unparseable) counts"""
+    string_fields = {'$or': [{field: {'$type': 'string'}} for field in TIMESTAMP_FIELDS]}
+    projection = {field: 1 for field in TIMESTAMP_FIELDS}
+    converted = unparseable = 0
+    last_id = None
+
+    while True:
+        query = string_fields if last_id is None else {'$and': [string_fields, {'_id': {'$gt': last_id}}]}
+        documents = list(collection.find(query, projection).sort('_id', 1).limit(batch_size))
+        if not documents:
+            return converted, unparseable
+
+        updates = []
+        for document in documents:
+            fields = {}
+            for field in TIMESTAMP_FIELDS:
+                if isinstance(document.get(field), str):
+                    try:
+                        fields[field] = datetime.fromisoformat(document[field])
+                    except ValueError:
+                        unparseable += 1
+                        logger.warning(f"⚠️ {document['_id']}: cannot parse {field} {document[field]!r}")
+            if fields:
+                updates.append(UpdateOne({'_id': document['_id']}, {'$set': fields}))
+
+        if updates:
+            converted += collection.bulk_write(updates, ordered=False).modified_count
+        last_id = documents[-1]['_id']
+        logger.info(f"📊 {converted} analyses converted")
+
+
+def main():
+    """Main migration function"""
+    parser = argparse.ArgumentParser(description='Store resume analysis timestamps as BSON datetimes')
+    parser.add_argument('--batch-size', type=int, default=1000, help='documents per bulk write')
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    load_dotenv()
+
+    client = MongoClient(os.getenv('MONGO_URI', 'mongodb://localhost:27017/resume_builder_ml'))
+    collection = client.get_default_database().resume_analyses
+
+    converted, unparseable = migrate(collection, args.batch_size)
+    logger.info(f"✅ Converted {converted} analyses ({unparseable} unparseable values left as strings)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("\n🛑 Migration interrupted by user; rerun to continue")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"❌ Migration failed with error: {e}")
+        sys.exit(1)
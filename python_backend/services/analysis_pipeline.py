@@ -0,0 +1,307 @@
+import time
+import logging
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from services.parser_pool import ParserPoolBusy
+from services.result_cache import ResultCache, hash_text
+
+logger = logging.getLogger(__name__)
+
+
+def calculate_overall_score(ml_analysis, gemini_analysis):
+    """Calculate overall resume score from ML and Gemini analyses"""
+    try:
+        ml_score = ml_analysis.get('overall_score', 0)
+        gemini_score = gemini_analysis.get('score', 0)
+
+        # Weighted average (60% Gemini, 40% ML)
+        overall_score = (gemini_score * 0.6 + ml_score * 0.4)
+        return round(overall_score, 2)
+    except:
+        return 0
+
+
+def ml_fallback(error):
+    """Placeholder for a failed or late ML stage, shaped like MLAnalyzer's own error result"""
+    return {
+        'error': error,
+        'overall_score': 0,
+        'recommendations': ['Unable to analyze resume due to processing error']
+    }
+
+
+def gemini_fallback(error):
+    """Placeholder for a failed or late Gemini stage, shaped like GeminiService's own error result"""
+    return {
+        'error': error,
+        'score': 0,
+        'feedback': 'AI analysis unavailable'
+    }
+
+
+class _Stage:
+    """A submitted stage whose deadline runs from the moment a worker picks it up"""
+
+    def __init__(self, executor, compute, *args):
+        self._started = threading.Event()
+        self._started_at = None
+        self.future = executor.submit(self._run, compute, *args)
+
+    def _run(self, compute, *args):
+        self._started_at = time.monotonic()
+        self._started.set()
+        return compute(*args)
+
+    def result(self, timeout):
+        """Wait up to timeout for a worker, then up to timeout from the stage's start"""
+        if not self._started.wait(timeout) and self.future.cancel():
+            raise FutureTimeoutError('stage did not start in time')
+        # A worker took it just as the wait ended
+        self._started.wait()
+        return self.future.result(timeout=max(self._started_at + timeout - time.monotonic(), 0))
+
+
+class AnalysisPipeline:
+    """Runs the parse, ML and Gemini stages that make up a resume analysis"""
+
+    def __init__(self, parser_pool, ml_analyzer, gemini_service, cache=None,
+                 ml_timeout=30, gemini_timeout=60, ml_workers=4, gemini_workers=8, parse_workers=4,
+                 vector_index=None):
+        self.parser_pool = parser_pool
+        self.ml_analyzer = ml_analyzer
+        self.gemini_service = gemini_service
+        self.cache = cache
+        self.vector_index = vector_index
+        self.ml_timeout = ml_timeout
+        self.gemini_timeout = gemini_timeout
+
+        # ML and Gemini only depend on the parsed data, so they run side by side. Each has its
+        # own pool: late Gemini calls keep their threads until they return and must not hold up ML.
+        self._ml_executor = ThreadPoolExecutor(max_workers=ml_workers, thread_name_prefix='analysis-ml')
+        self._gemini_executor = ThreadPoolExecutor(max_workers=gemini_workers, thread_name_prefix='analysis-gemini')
+        # Batch parses only wait on the parser pool, from their own bounded set of threads
+        self._parse_executor = ThreadPoolExecutor(max_workers=parse_workers, thread_name_prefix='analysis-parse')
+
+    def parse_resume(self, file):
+        """Read an uploaded file and parse it, reusing cached results for identical bytes"""
+        parser = self.parser_pool.parser
+        if not parser.is_supported(file.filename):
+            return {
+                'success': False,
+                'message': 'Unsupported file format. Please upload PDF or DOCX files.'
+            }
+
+        upload = parser.read_upload(file)
+        try:
+            return self.parse(upload)
+        finally:
+            parser.release_upload(upload)
+
+    def parse(self, upload):
+        """Parse an upload read with ResumeParser.read_upload"""
+        parser = self.parser_pool.parser
+        key = self.cache.make_key('parse', parser.VERSION, parser.options_key, upload['sha256']) if self.cache else None
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.info(f"Parse cache hit for {upload['sha256'][:12]}")
+                return cached
+
+        parsed_data = self.parser_pool.parse_upload(upload)
+
+        if key and parsed_data.get('success'):
+            self.cache.set(key, parsed_data)
+        return parsed_data
+
+    def parse_many(self, uploads):
+        """Parse several uploads side by side; results are in upload order
+
+        A full parser backlog fails only the uploads it turned away.
+        """
+        return list(self._parse_executor.map(self._parse_or_busy, uploads))
+
+    def _parse_or_busy(self, upload):
+        try:
+            return self.parse(upload)
+        except ParserPoolBusy as e:
+            return {
+                'success': False,
+                'message': str(e)
+            }
+
+    def analyze(self, user_id, parsed_data):
+        """Run the ML and Gemini stages and build the stored analysis document"""
+        logger.info("Starting ML and Gemini analysis")
+        ml_analysis, gemini_analysis, incomplete_stages = self._run_stages(parsed_data, ('ml', 'gemini'))
+        return self._build_analysis(user_id, parsed_data, ml_analysis, gemini_analysis, incomplete_stages)
+
+    def reanalyze(self, analysis):
+        """Re-run the stages a stored partial analysis is missing; returns the rebuilt analysis
+
+        A stage that timed out keeps running and caches its result, so a retry after it
+        finished is answered from the cache.
+        """
+        parsed_data = analysis['parsed_data']
+        stages = analysis.get('incomplete_stages', [])
+        logger.info(f"Re-running {', '.join(stages)} analysis")
+        ml_analysis, gemini_analysis, incomplete_stages = self._run_stages(
+            parsed_data, stages, analysis['ml_analysis'], analysis['gemini_analysis']
+        )
+
+        rebuilt = self._build_analysis(analysis['user_id'], parsed_data, ml_analysis, gemini_analysis, incomplete_stages)
+        # Keep the analysis where it was in the user's history
+        rebuilt['timestamp'] = analysis['timestamp']
+        return rebuilt
+
+    def _run_stages(self, parsed_data, stages, ml_analysis=None, gemini_analysis=None):
+        """Run the named stages side by side; returns (ml_analysis, gemini_analysis, incomplete_stages)"""
+        text_key = self._text_key(parsed_data)
+
+        # Start both stages; the Gemini call is network bound and overlaps the ML work
+        ml_stage = self._submit_ml(parsed_data, text_key) if 'ml' in stages else None
+        gemini_stage = self._submit_gemini(parsed_data, text_key) if 'gemini' in stages else None
+
+        # Late or failed stages get the same zero-score shape the services return on errors
+        incomplete_stages = []
+        if ml_stage:
+            ml_analysis = self._stage_result(ml_stage, 'ml', self.ml_timeout, incomplete_stages, ml_fallback)
+        if gemini_stage:
+            gemini_analysis = self._stage_result(
+                gemini_stage, 'gemini', self.gemini_timeout, incomplete_stages, gemini_fallback
+            )
+        return ml_analysis, gemini_analysis, incomplete_stages
+
+    def analyze_many(self, user_id, parsed_list):
+        """Analyze several parsed resumes: one ML batch, with the Gemini calls side by side"""
+        text_keys = [self._text_key(parsed_data) for parsed_data in parsed_list]
+
+        logger.info(f"Starting ML and Gemini analysis of {len(parsed_list)} resumes")
+        ml_stage = _Stage(
+            self._ml_executor,
+            self._cached_batch_stage,
+            [('ml', self.ml_analyzer.model_version, text_key) for text_key in text_keys],
+            parsed_list,
+            self.ml_analyzer.analyze_batch
+        )
+        gemini_stages = [
+            self._submit_gemini(parsed_data, text_key) for parsed_data, text_key in zip(parsed_list, text_keys)
+        ]
+
+        ml_incomplete = []
+        ml_analyses = self._stage_result(
+            ml_stage, 'ml', self.ml_timeout, ml_incomplete,
+            lambda error: [ml_fallback(error) for _ in parsed_list]
+        )
+
+        analyses = []
+        for parsed_data, ml_analysis, gemini_stage in zip(parsed_list, ml_analyses, gemini_stages):
+            incomplete_stages = list(ml_incomplete)
+            gemini_analysis = self._stage_result(
+                gemini_stage, 'gemini', self.gemini_timeout, incomplete_stages, gemini_fallback
+            )
+            analyses.append(self._build_analysis(user_id, parsed_data, ml_analysis, gemini_analysis, incomplete_stages))
+        return analyses
+
+    def _text_key(self, parsed_data):
+        """Stage cache key part for a parsed resume: the exact extracted text and the parser settings
+        that shaped it (stats engine, limits), since both change ML and Gemini input"""
+        parser = self.parser_pool.parser
+        return ResultCache.make_key('text', parser.VERSION, parser.options_key, hash_text(parsed_data.get('raw_text', '')))
+
+    def _submit_ml(self, parsed_data, text_key):
+        return _Stage(
+            self._ml_executor,
+            self._cached_stage,
+            ('ml', self.ml_analyzer.model_version, text_key),
+            lambda: self.ml_analyzer.analyze_resume(parsed_data)
+        )
+
+    def _submit_gemini(self, parsed_data, text_key):
+        return _Stage(
+            self._gemini_executor,
+            self._cached_stage,
+            ('gemini', self.gemini_service.model_name, self.gemini_service.PROMPT_VERSION, text_key),
+            lambda: self.gemini_service.analyze_resume(parsed_data)
+        )
+
+    def _build_analysis(self, user_id, parsed_data, ml_analysis, gemini_analysis, incomplete_stages):
+        """Create comprehensive analysis"""
+        return {
+            'user_id': user_id,
+            'parsed_data': parsed_data,
+            'ml_analysis': ml_analysis,
+            'gemini_analysis': gemini_analysis,
+            'overall_score': calculate_overall_score(ml_analysis, gemini_analysis),
+            'partial': bool(incomplete_stages),
+            'incomplete_stages': incomplete_stages,
+            'timestamp': datetime.utcnow()
+        }
+
+    def index_analysis(self, analysis_id, analysis):
+        """Add a stored analysis to the job-description matching index"""
+        if not self.vector_index:
+            return
+
+        try:
+            self.vector_index.add(analysis_id, analysis['parsed_data'].get('raw_text', ''), analysis['user_id'])
+        except Exception as e:
+            # Matching is secondary; a missed document is picked up by the next rebuild
+            logger.error(f"Failed to index analysis {analysis_id}: {str(e)}")
+
+    def _stage_result(self, pending, stage, timeout, incomplete_stages, fallback):
+        """Wait for a stage until its deadline, falling back to a placeholder if it is late or fails"""
+        try:
+            return pending.result(timeout)
+        except FutureTimeoutError:
+            # A started stage keeps running and still fills the cache when it finishes,
+            # so retrying the partial analysis later picks its result up
+            logger.warning(f"{stage} stage timed out, returning partial analysis")
+            error = f'{stage} analysis timed out'
+        except Exception as e:
+            logger.error(f"{stage} stage failed: {str(e)}")
+            error = str(e)
+
+        incomplete_stages.append(stage)
+        return fallback(error)
+
+    def _cached_stage(self, key_parts, compute):
+        """Return a cached stage result, computing and storing it on a miss; errors and fallbacks are never cached"""
+        if not self.cache:
+            return compute()
+
+        key = self.cache.make_key(*key_parts)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info(f"{key_parts[0]} stage cache hit")
+            return cached
+
+        result = compute()
+        if self._cacheable(result):
+            self.cache.set(key, result)
+        return result
+
+    def _cached_batch_stage(self, key_parts_list, items, compute_batch):
+        """Batch form of _cached_stage: compute_batch runs once, over the items missing from the cache"""
+        if not self.cache:
+            return compute_batch(items)
+
+        keys = [self.cache.make_key(*key_parts) for key_parts in key_parts_list]
+        results = [self.cache.get(key) for key in keys]
+        missing = [row for row, result in enumerate(results) if result is None]
+        if len(missing) < len(results):
+            logger.info(f"{key_parts_list[0][0]} stage cache hits for {len(results) - len(missing)} of {len(results)} resumes")
+
+        if missing:
+            computed = compute_batch([items[row] for row in missing])
+            for row, result in zip(missing, computed):
+                results[row] = result
+                if self._cacheable(result):
+                    self.cache.set(keys[row], result)
+        return results
+
+    @staticmethod
+    def _cacheable(result):
+        """Errors and canned fallbacks (e.g. an unparseable Gemini reply) are worth retrying, not caching"""
+        return 'error' not in result and not result.get('fallback')
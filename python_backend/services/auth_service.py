@@ -1,6 +1,7 @@
 import bcrypt
 from datetime import datetime
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 import re
 import logging
 
@@ -72,6 +73,12 @@ class AuthService:
                 'user': user_doc
             }
             
+        except DuplicateKeyError:
+            # A concurrent registration won the race past the check above
+            return {
+                'success': False,
+                'message': 'User with this email or username already exists'
+            }
         except Exception as e:
             logger.error(f"Registration error: {str(e)}")
             return {
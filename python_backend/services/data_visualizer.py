@@ -1,28 +1,87 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import base64
-import io
+import hashlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
-from wordcloud import WordCloud
 import os
 
 logger = logging.getLogger(__name__)
 
+# matplotlib, plotly, pandas and wordcloud are imported on first use;
+# DataVisualizer.prewarm() loads them ahead of the first request
+_matplotlib_configured = False
+_matplotlib_lock = threading.Lock()
+
+
+def _configure_matplotlib():
+    """Apply the chart style once per process, before any figure is rendered
+
+    Rendering goes through Figure and the Agg canvas, never pyplot, so figures carry no
+    shared state and can be drawn from several threads at once; the style (global
+    rcParams) is only read after this point.
+    """
+    global _matplotlib_configured
+    if not _matplotlib_configured:
+        with _matplotlib_lock:
+            if not _matplotlib_configured:
+                import matplotlib.style
+                matplotlib.style.use('seaborn-v0_8')
+                _matplotlib_configured = True
+
 class DataVisualizer:
-    def __init__(self):
-        # Set style for matplotlib
-        plt.style.use('seaborn-v0_8')
-        sns.set_palette("husl")
-        
+    # Bump whenever rendered output changes so cached visualizations are invalidated
+    VERSION = '2'
+    WORDCLOUD_FORMATS = ('png', 'svg', 'webp')
+    WORDCLOUD_URL_PREFIX = '/api/visualizations'
+    
+    def __init__(self, cache=None, wordcloud_format='png', render_workers=2, render_timeout=30):
         # Create output directory for visualizations
         self.output_dir = 'static/visualizations'
         os.makedirs(self.output_dir, exist_ok=True)
+        self.cache = cache
+        if wordcloud_format not in self.WORDCLOUD_FORMATS:
+            raise ValueError(f"Unknown word cloud format '{wordcloud_format}', expected one of {self.WORDCLOUD_FORMATS}")
+        self.wordcloud_format = wordcloud_format
+        
+        # Bounded image rendering; a file requested again while it renders waits for that render
+        self.render_timeout = render_timeout
+        self._render_executor = ThreadPoolExecutor(max_workers=render_workers, thread_name_prefix='visualizer-render')
+        self._rendering = {}
+        self._rendering_lock = threading.Lock()
+    
+    def prewarm(self):
+        """Import the plotting libraries ahead of the first visualization request"""
+        _configure_matplotlib()
+        import matplotlib.backends.backend_agg  # noqa: F401
+        import pandas  # noqa: F401
+        import plotly.express  # noqa: F401
+        import plotly.graph_objects  # noqa: F401
+        import wordcloud  # noqa: F401
+    
+    def etag(self, analysis_id, revision=0):
+        """Validator for an analysis' visualizations; a completed analysis only changes when a retry bumps its revision"""
+        return f'{self.VERSION}-{analysis_id}-{revision}'
+    
+    @staticmethod
+    def complete(visualizations):
+        """True unless rendering failed as a whole or for some chart; only complete results are cached"""
+        return 'error' not in visualizations and 'failed_charts' not in visualizations
+    
+    def get_resume_visualizations(self, analysis_id, analysis_data):
+        """Visualizations of a stored analysis, rendered once per visualizer version and analysis revision"""
+        if not self.cache:
+            return self.create_resume_visualizations(analysis_data)
+        
+        key = self.cache.make_key('visualizations', self.VERSION, analysis_id, analysis_data.get('revision', 0))
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info(f"Visualization cache hit for {analysis_id}")
+            return cached
+        
+        visualizations = self.create_resume_visualizations(analysis_data)
+        if self.complete(visualizations):
+            self.cache.set(key, visualizations)
+        return visualizations
     
     def create_resume_visualizations(self, analysis_data):
         """Create comprehensive visualizations for resume analysis"""
@@ -30,6 +89,16 @@ class DataVisualizer:
             logger.info("Creating resume visualizations")
             
             visualizations = {}
+            failed_charts = []
+            
+            def add_chart(name, create, *args):
+                # None means no data to chart; a chart that raised is None too, but listed in
+                # failed_charts so the result is neither cached nor given an ETag
+                try:
+                    visualizations[name] = create(*args)
+                except Exception:
+                    visualizations[name] = None
+                    failed_charts.append(name)
             
             # Extract data from analysis
             ml_analysis = analysis_data.get('ml_analysis', {})
@@ -37,28 +106,33 @@ class DataVisualizer:
             parsed_data = analysis_data.get('parsed_data', {})
             
             # 1. Overall Score Visualization
-            visualizations['score_chart'] = self._create_score_visualization(ml_analysis, gemini_analysis)
+            add_chart('score_chart', self._create_score_visualization, ml_analysis, gemini_analysis)
             
             # 2. Skills Analysis
-            visualizations['skills_chart'] = self._create_skills_visualization(parsed_data.get('skills', []))
+            add_chart('skills_chart', self._create_skills_visualization, parsed_data.get('skills', []))
             
             # 3. Category Scores Radar Chart
-            visualizations['radar_chart'] = self._create_radar_chart(gemini_analysis.get('category_scores', {}))
+            add_chart('radar_chart', self._create_radar_chart, gemini_analysis.get('category_scores', {}))
             
             # 4. Experience Timeline
-            visualizations['timeline'] = self._create_experience_timeline(parsed_data.get('experience', []))
+            add_chart('timeline', self._create_experience_timeline, parsed_data.get('experience', []))
             
             # 5. Skills Word Cloud
-            visualizations['wordcloud'] = self._create_skills_wordcloud(parsed_data.get('skills', []))
+            add_chart('wordcloud', self._create_skills_wordcloud, parsed_data.get('skills', []))
             
             # 6. Text Analysis Metrics
-            visualizations['text_metrics'] = self._create_text_metrics_chart(parsed_data.get('text_analysis', {}))
+            add_chart('text_metrics', self._create_text_metrics_chart, parsed_data.get('text_analysis', {}))
             
             # 7. Industry Fit Analysis
-            visualizations['industry_fit'] = self._create_industry_fit_chart(ml_analysis.get('industry_classification', {}))
+            add_chart('industry_fit', self._create_industry_fit_chart, ml_analysis.get('industry_classification', {}))
             
             # 8. Improvement Areas
-            visualizations['improvement_areas'] = self._create_improvement_chart(gemini_analysis.get('category_scores', {}))
+            add_chart('improvement_areas', self._create_improvement_chart, gemini_analysis.get('category_scores', {}))
+            
+            if failed_charts:
+                visualizations['failed_charts'] = failed_charts
+                logger.warning(f"Visualizations created without {', '.join(failed_charts)}")
+                return visualizations
             
             logger.info("Visualizations created successfully")
             return visualizations
@@ -69,6 +143,8 @@ class DataVisualizer:
     
     def _create_score_visualization(self, ml_analysis, gemini_analysis):
         """Create overall score comparison visualization"""
+        import plotly.graph_objects as go
+        
         try:
             ml_score = ml_analysis.get('overall_score', 0)
             gemini_score = gemini_analysis.get('score', 0)
@@ -107,10 +183,12 @@ class DataVisualizer:
             
         except Exception as e:
             logger.error(f"Score visualization error: {str(e)}")
-            return None
+            raise
     
     def _create_skills_visualization(self, skills):
         """Create skills distribution visualization"""
+        import plotly.express as px
+        
         try:
             if not skills:
                 return None
@@ -152,10 +230,12 @@ class DataVisualizer:
             
         except Exception as e:
             logger.error(f"Skills visualization error: {str(e)}")
-            return None
+            raise
     
     def _create_radar_chart(self, category_scores):
         """Create radar chart for category scores"""
+        import plotly.graph_objects as go
+        
         try:
             if not category_scores:
                 return None
@@ -191,10 +271,13 @@ class DataVisualizer:
             
         except Exception as e:
             logger.error(f"Radar chart error: {str(e)}")
-            return None
+            raise
     
     def _create_experience_timeline(self, experience):
         """Create experience timeline visualization"""
+        import pandas as pd
+        import plotly.express as px
+        
         try:
             if not experience:
                 return None
@@ -225,50 +308,80 @@ class DataVisualizer:
             
         except Exception as e:
             logger.error(f"Timeline visualization error: {str(e)}")
-            return None
+            raise
     
     def _create_skills_wordcloud(self, skills):
-        """Create word cloud from skills"""
+        """Create word cloud from skills, rendered once per distinct skill set and served by URL"""
         try:
             if not skills:
                 return None
             
-            # Create word frequency dictionary
-            skills_text = ' '.join(skills)
-            
-            # Generate word cloud
-            wordcloud = WordCloud(
-                width=800, 
-                height=400, 
-                background_color='white',
-                colormap='viridis',
-                max_words=50
-            ).generate(skills_text)
-            
-            # Convert to base64 for web display
-            img_buffer = io.BytesIO()
-            plt.figure(figsize=(10, 5))
-            plt.imshow(wordcloud, interpolation='bilinear')
-            plt.axis('off')
-            plt.title('Skills Word Cloud')
-            plt.tight_layout()
-            plt.savefig(img_buffer, format='png', bbox_inches='tight', dpi=150)
-            img_buffer.seek(0)
-            
-            img_base64 = base64.b64encode(img_buffer.read()).decode()
-            plt.close()
+            # Content-addressed file name: the same skills always map to the same immutable file
+            digest = hashlib.sha256('\n'.join([self.VERSION] + sorted(skills)).encode('utf-8')).hexdigest()
+            filename = f'wordcloud-{digest[:32]}.{self.wordcloud_format}'
+            path = os.path.join(self.output_dir, filename)
+            
+            if not os.path.exists(path):
+                self._render_once(path, lambda: self._render_wordcloud(' '.join(skills), path))
             
             return {
                 'type': 'image',
-                'data': f"data:image/png;base64,{img_base64}"
+                'format': self.wordcloud_format,
+                'url': f'{self.WORDCLOUD_URL_PREFIX}/{filename}'
             }
             
         except Exception as e:
             logger.error(f"Word cloud error: {str(e)}")
-            return None
+            raise
+    
+    def _render_once(self, path, render):
+        """Run render on the renderer pool unless the same file is already being rendered"""
+        with self._rendering_lock:
+            future = self._rendering.get(path)
+            if future is None:
+                future = self._render_executor.submit(render)
+                self._rendering[path] = future
+                future.add_done_callback(lambda _: self._forget_render(path))
+        future.result(timeout=self.render_timeout)
+    
+    def _forget_render(self, path):
+        with self._rendering_lock:
+            self._rendering.pop(path, None)
+    
+    def _render_wordcloud(self, skills_text, path):
+        """Render a word cloud image to path, atomically so concurrent renders never expose partial files"""
+        from wordcloud import WordCloud
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        
+        _configure_matplotlib()
+        
+        # Generate word cloud
+        wordcloud = WordCloud(
+            width=800, 
+            height=400, 
+            background_color='white',
+            colormap='viridis',
+            max_words=50
+        ).generate(skills_text)
+        
+        # A private figure and canvas per render: nothing is shared with other threads
+        figure = Figure(figsize=(10, 5))
+        FigureCanvasAgg(figure)
+        axes = figure.subplots()
+        axes.imshow(wordcloud, interpolation='bilinear')
+        axes.axis('off')
+        axes.set_title('Skills Word Cloud')
+        figure.tight_layout()
+        
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        figure.savefig(temp_path, format=self.wordcloud_format, bbox_inches='tight', dpi=150)
+        os.replace(temp_path, path)
     
     def _create_text_metrics_chart(self, text_analysis):
         """Create text analysis metrics visualization"""
+        import plotly.graph_objects as go
+        
         try:
             if not text_analysis:
                 return None
@@ -301,10 +414,12 @@ class DataVisualizer:
             
         except Exception as e:
             logger.error(f"Text metrics chart error: {str(e)}")
-            return None
+            raise
     
     def _create_industry_fit_chart(self, industry_classification):
         """Create industry fit analysis chart"""
+        import plotly.express as px
+        
         try:
             if not industry_classification or 'industry_scores' not in industry_classification:
                 return None
@@ -317,7 +432,7 @@ class DataVisualizer:
             industries = [item[0] for item in sorted_industries]
             scores = [item[1] for item in sorted_industries]
             
-            fig = px.horizontal_bar(
+            fig = px.bar(
                 x=scores,
                 y=industries,
                 title='Industry Fit Analysis',
@@ -331,10 +446,12 @@ class DataVisualizer:
             
         except Exception as e:
             logger.error(f"Industry fit chart error: {str(e)}")
-            return None
+            raise
     
     def _create_improvement_chart(self, category_scores):
         """Create improvement areas visualization"""
+        import plotly.graph_objects as go
+        
         try:
             if not category_scores:
                 return None
@@ -374,10 +491,13 @@ class DataVisualizer:
             
         except Exception as e:
             logger.error(f"Improvement chart error: {str(e)}")
-            return None
+            raise
     
     def create_comparison_chart(self, multiple_analyses):
         """Create comparison chart for multiple resume analyses"""
+        import pandas as pd
+        import plotly.express as px
+        
         try:
             if len(multiple_analyses) < 2:
                 return None
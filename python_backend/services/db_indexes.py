@@ -0,0 +1,84 @@
+import logging
+from datetime import datetime
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Indexes backing every service query, by collection. The analysis cache TTL index is
+# owned by ResultCache because its expiry comes from configuration.
+INDEXES = {
+    'users': [
+        # register_user checks email OR username; authenticate_user filters email + is_active
+        IndexModel([('email', ASCENDING)], name='email_unique', unique=True),
+        IndexModel([('username', ASCENDING)], name='username_unique', unique=True)
+    ],
+    'resume_analyses': [
+        # History pages through a user's analyses newest first, keyed on (timestamp, _id);
+        # get_analysis filters _id + user_id
+        IndexModel([('user_id', ASCENDING), ('timestamp', DESCENDING), ('_id', DESCENDING)], name='user_timestamp_id'),
+        # Only batch uploads set batch_id
+        IndexModel([('batch_id', ASCENDING)], name='batch_id', sparse=True),
+        # bulk_import.py upserts on the imported file, so a rerun never duplicates it
+        IndexModel([('source_path', ASCENDING), ('user_id', ASCENDING)], name='source_path_user_id', unique=True,
+                   partialFilterExpression={'source_path': {'$exists': True}}),
+        # The job runner sweeps unfinished jobs by status and owning runner
+        IndexModel([('status', ASCENDING), ('runner_id', ASCENDING)], name='status_runner_id')
+    ],
+    'job_runners': [
+        # Runners that stopped beating are removed after a day
+        IndexModel([('heartbeat', ASCENDING)], name='heartbeat_ttl', expireAfterSeconds=24 * 3600)
+    ]
+}
+
+# Representative service queries, checked with explain() by manage_indexes.py --check.
+# Filter values are placeholders: plan selection depends on the fields, not the values.
+SERVICE_QUERIES = [
+    ('register_user', 'users', {'$or': [{'email': 'check@example.com'}, {'username': 'check'}]}, None),
+    ('authenticate_user', 'users', {'email': 'check@example.com', 'is_active': True}, None),
+    ('get_resume_history', 'resume_analyses', {'user_id': 'check'}, [('timestamp', DESCENDING), ('_id', DESCENDING)]),
+    ('get_resume_history_page', 'resume_analyses', {
+        'user_id': 'check',
+        '$or': [
+            {'timestamp': {'$lt': datetime(2000, 1, 1)}},
+            {'timestamp': datetime(2000, 1, 1), '_id': {'$lt': ObjectId('0' * 24)}}
+        ]
+    }, [('timestamp', DESCENDING), ('_id', DESCENDING)]),
+    ('get_batch_status', 'resume_analyses', {'batch_id': 'check', 'user_id': 'check'}, None),
+    ('fail_orphaned_jobs', 'resume_analyses', {'status': {'$in': ['queued', 'processing']}, 'runner_id': {'$nin': ['check']}}, None),
+    ('cache_lookup', 'analysis_cache', {'_id': 'check'}, None)
+]
+
+
+def ensure_indexes(db):
+    """Create any missing indexes; returns the names of the indexes in place"""
+    names = []
+    for collection_name, models in INDEXES.items():
+        try:
+            names.extend(db[collection_name].create_indexes(models))
+        except OperationFailure as e:
+            # e.g. existing duplicate emails block the unique index; the other collections still get theirs
+            logger.error(f"Could not create indexes on {collection_name}: {str(e)}")
+    return names
+
+
+def _plan_stages(plan):
+    """Every stage name in an explain() plan tree"""
+    stages = [plan.get('stage')]
+    for child in plan.get('inputStages', []) + [plan[key] for key in ('inputStage', 'queryPlan') if key in plan]:
+        stages.extend(_plan_stages(child))
+    return [stage for stage in stages if stage]
+
+
+def explain_service_queries(db):
+    """Winning plan stages of each service query: [(name, collection, stages)]"""
+    plans = []
+    for name, collection_name, query, sort in SERVICE_QUERIES:
+        cursor = db[collection_name].find(query).limit(20)
+        if sort:
+            cursor = cursor.sort(sort)
+        winning_plan = cursor.explain()['queryPlanner']['winningPlan']
+        plans.append((name, collection_name, _plan_stages(winning_plan)))
+    return plans
+
@@ -0,0 +1,68 @@
+import re
+import xml.etree.ElementTree as ElementTree
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+PARAGRAPH = f'{W}p'
+TEXT = f'{W}t'
+# Run content that python-docx renders as characters
+RUN_CHARACTERS = {f'{W}tab': '\t', f'{W}ptab': '\t', f'{W}br': '\n', f'{W}cr': '\n', f'{W}noBreakHyphen': '-'}
+
+HEADER_PART = re.compile(r'word/header\d*\.xml$')
+FOOTER_PART = re.compile(r'word/footer\d*\.xml$')
+BODY_PART = 'word/document.xml'
+
+
+def docx_parts(archive):
+    """Text-bearing parts of a DOCX archive in reading order: headers, body, footers"""
+    names = archive.namelist()
+    headers = sorted(name for name in names if HEADER_PART.match(name))
+    footers = sorted(name for name in names if FOOTER_PART.match(name))
+    return headers + [BODY_PART] + footers
+
+
+def iter_part_paragraphs(stream):
+    """Yield the text of every paragraph in a WordprocessingML part, streaming the XML
+
+    Covers body paragraphs, table cells, content controls and text boxes; a text box
+    paragraph is yielded before the paragraph it is anchored in. The VML fallback copy
+    of each drawing (mc:Fallback) is skipped so text boxes are not read twice.
+    """
+    open_paragraphs = []
+    fallback_depth = 0
+
+    for event, element in ElementTree.iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if tag == MC_FALLBACK:
+            fallback_depth += 1 if event == 'start' else -1
+            continue
+        if fallback_depth:
+            if event == 'end':
+                element.clear()
+            continue
+
+        if event == 'start':
+            if tag == PARAGRAPH:
+                open_paragraphs.append([])
+            continue
+
+        if open_paragraphs:
+            if tag == TEXT:
+                open_paragraphs[-1].append(element.text or '')
+            elif tag in RUN_CHARACTERS:
+                open_paragraphs[-1].append(RUN_CHARACTERS[tag])
+            elif tag == PARAGRAPH:
+                yield ''.join(open_paragraphs.pop())
+        # Parsed elements are no longer needed; clearing them keeps memory flat on long documents
+        element.clear()
+
+
+def iter_docx_paragraphs(archive):
+    """Yield paragraph texts of an open DOCX zipfile.ZipFile, part by part"""
+    names = set(archive.namelist())
+    for part in docx_parts(archive):
+        if part not in names:
+            continue
+        with archive.open(part) as stream:
+            yield from iter_part_paragraphs(stream)
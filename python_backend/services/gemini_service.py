@@ -1,21 +1,38 @@
-import google.generativeai as genai
 import json
 import logging
+import threading
 from typing import Dict, Any
 import time
 
 logger = logging.getLogger(__name__)
 
 class GeminiService:
-    def __init__(self, api_key):
+    # Bump whenever the analysis prompt changes so cached Gemini results are invalidated
+    PROMPT_VERSION = '1'
+    
+    def __init__(self, api_key, model_name='gemini-pro'):
         self.api_key = api_key
-        if api_key:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-pro')
-        else:
-            self.model = None
+        self.model_name = model_name
+        self._model = None
+        self._model_lock = threading.Lock()
+        if not api_key:
             logger.warning("Gemini API key not provided")
     
+    @property
+    def model(self):
+        """Gemini client, created on first use so the SDK import stays off the startup path"""
+        if self._model is None and self.api_key:
+            with self._model_lock:
+                if self._model is None:
+                    import google.generativeai as genai
+                    genai.configure(api_key=self.api_key)
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+    
+    def prewarm(self):
+        """Import the Gemini SDK and create the client ahead of the first analysis"""
+        return self.model is not None
+    
     def analyze_resume(self, parsed_data):
         """Analyze resume using Google Gemini AI"""
         if not self.model:
@@ -188,6 +205,8 @@ Respond ONLY with the JSON format specified above.
     
     def _get_gemini_response(self, prompt, max_retries=3):
         """Get response from Gemini with retry logic"""
+        import google.generativeai as genai
+        
         for attempt in range(max_retries):
             try:
                 logger.info(f"Gemini API attempt {attempt + 1}")
@@ -306,6 +325,7 @@ Respond ONLY with the JSON format specified above.
             'competitive_advantage': ['Unique qualifications identified'],
             'ai_provider': 'Google Gemini Pro (Fallback)',
             'analysis_timestamp': time.time(),
+            'fallback': True,
             'note': 'This is a fallback analysis due to response formatting issues'
         }
     
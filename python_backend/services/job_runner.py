@@ -0,0 +1,193 @@
+import os
+import uuid
+import socket
+import logging
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Analysis document statuses; documents written before jobs existed have no status
+STATUS_QUEUED = 'queued'
+STATUS_PROCESSING = 'processing'
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+
+
+class JobQueueFull(Exception):
+    """Raised when too many analysis jobs are already waiting"""
+
+
+class AnalysisJobRunner:
+    """Runs resume analyses in background threads and records progress on the analysis document
+
+    Jobs live only in this process, so every job document records the runner that owns it and
+    each runner keeps a heartbeat in the runners collection. Queued or processing jobs whose
+    runner stopped beating (a restart or crash) are marked failed by whichever runner is alive.
+    """
+
+    def __init__(self, collection, pipeline, max_workers=4, max_pending=64, runners=None,
+                 heartbeat_interval=30, runner_timeout=120):
+        self.collection = collection
+        self.pipeline = pipeline
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+
+        self.runners = runners
+        self.runner_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self.heartbeat_interval = heartbeat_interval
+        self.runner_timeout = runner_timeout
+        self._stopped = threading.Event()
+
+    def submit(self, user_id, upload):
+        """Create a queued analysis document and schedule its stages; returns the job id"""
+        if not self._slots.acquire(blocking=False):
+            raise JobQueueFull('Too many resumes are being analyzed, please retry shortly')
+
+        try:
+            job_id = self.collection.insert_one({
+                'user_id': user_id,
+                'status': STATUS_QUEUED,
+                'filename': upload['filename'],
+                'runner_id': self.runner_id,
+                'timestamp': datetime.utcnow()
+            }).inserted_id
+
+            future = self._executor.submit(self._run, job_id, user_id, upload)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return str(job_id)
+
+    def submit_batch(self, user_id, uploads, batch_id):
+        """Create queued documents for several uploads with one bulk write; returns their job ids
+
+        Either every upload is queued or, when the backlog lacks room for all of them, none is.
+        """
+        acquired = 0
+        try:
+            while acquired < len(uploads) and self._slots.acquire(blocking=False):
+                acquired += 1
+            if acquired < len(uploads):
+                raise JobQueueFull('Too many resumes are being analyzed, please retry shortly')
+
+            timestamp = datetime.utcnow()
+            job_ids = self.collection.insert_many([
+                {
+                    'user_id': user_id,
+                    'status': STATUS_QUEUED,
+                    'filename': upload['filename'],
+                    'batch_id': batch_id,
+                    'runner_id': self.runner_id,
+                    'timestamp': timestamp
+                }
+                for upload in uploads
+            ]).inserted_ids
+        except Exception:
+            for _ in range(acquired):
+                self._slots.release()
+            raise
+
+        for job_id, upload in zip(job_ids, uploads):
+            future = self._executor.submit(self._run, job_id, user_id, upload)
+            future.add_done_callback(lambda _: self._slots.release())
+        return [str(job_id) for job_id in job_ids]
+
+    def _run(self, job_id, user_id, upload):
+        """Execute every stage for one job, storing the result or the failure"""
+        try:
+            # Every transition is conditional on this runner still owning the job: a sweep by
+            # another runner may have failed it as orphaned, and that outcome stands
+            claimed = self.collection.update_one(
+                {'_id': job_id, 'status': STATUS_QUEUED, 'runner_id': self.runner_id},
+                {'$set': {'status': STATUS_PROCESSING}}
+            )
+            if not claimed.matched_count:
+                logger.warning(f"Analysis job {job_id} was failed as orphaned before it started")
+                return
+
+            logger.info(f"Parsing resume for job {job_id}")
+            parsed_data = self.pipeline.parse(upload)
+
+            if not parsed_data['success']:
+                self._set_status(job_id, STATUS_FAILED, message=parsed_data.get('message'), error=parsed_data.get('error'))
+                return
+
+            analysis = self.pipeline.analyze(user_id, parsed_data['data'])
+            # The submission timestamp stays: history pages are keyed on it
+            del analysis['timestamp']
+            analysis['status'] = STATUS_COMPLETED
+            analysis['completed_at'] = datetime.utcnow()
+            completed = self.collection.update_one(
+                {'_id': job_id, 'status': STATUS_PROCESSING, 'runner_id': self.runner_id},
+                {'$set': analysis}
+            )
+            if not completed.matched_count:
+                logger.warning(f"Analysis job {job_id} was failed as orphaned while running; result discarded")
+                return
+            self.pipeline.index_analysis(job_id, analysis)
+            logger.info(f"Analysis job {job_id} completed")
+
+        except Exception as e:
+            logger.error(f"Analysis job {job_id} failed: {str(e)}")
+            self._set_status(job_id, STATUS_FAILED, message='Resume analysis failed', error=str(e))
+        finally:
+            self.pipeline.parser_pool.parser.release_upload(upload)
+
+    def start(self):
+        """Record this runner's first heartbeat, then keep beating and failing jobs orphaned by dead runners
+
+        Call before accepting jobs: the first heartbeat is written on the calling thread, so no
+        other runner's sweep sees this runner's jobs without a live heartbeat.
+        """
+        if self.runners is None:
+            return
+        try:
+            self._beat()
+        except Exception as e:
+            logger.error(f"Analysis job heartbeat failed: {str(e)}")
+        threading.Thread(target=self._heartbeat_loop, name='analysis-job-heartbeat', daemon=True).start()
+
+    def _beat(self):
+        self.runners.update_one({'_id': self.runner_id}, {'$set': {'heartbeat': datetime.utcnow()}}, upsert=True)
+
+    def _heartbeat_loop(self):
+        while not self._stopped.is_set():
+            try:
+                self._beat()
+                self.fail_orphaned_jobs()
+            except Exception as e:
+                logger.error(f"Analysis job heartbeat failed: {str(e)}")
+            self._stopped.wait(self.heartbeat_interval)
+
+    def fail_orphaned_jobs(self):
+        """Mark queued and processing jobs of runners without a recent heartbeat as failed"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.runner_timeout)
+        alive = [runner['_id'] for runner in self.runners.find({'heartbeat': {'$gte': cutoff}}, {'_id': 1})]
+
+        # Jobs written before runners were recorded have no runner_id, which $nin also matches
+        result = self.collection.update_many(
+            {'status': {'$in': [STATUS_QUEUED, STATUS_PROCESSING]}, 'runner_id': {'$nin': alive}},
+            {'$set': {
+                'status': STATUS_FAILED,
+                'message': 'Resume analysis was interrupted by a server restart, please upload it again',
+                'error': 'analysis job orphaned'
+            }}
+        )
+        if result.modified_count:
+            logger.warning(f"Marked {result.modified_count} orphaned analysis jobs as failed")
+        return result.modified_count
+
+    def _set_status(self, job_id, status, **fields):
+        try:
+            self.collection.update_one({'_id': job_id}, {'$set': dict(fields, status=status)})
+        except Exception as e:
+            logger.error(f"Failed to update status of job {job_id}: {str(e)}")
+
+    def shutdown(self, wait=True):
+        self._stopped.set()
+        self._executor.shutdown(wait=wait)
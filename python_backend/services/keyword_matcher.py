@@ -0,0 +1,111 @@
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def _is_word_char(char):
+    """Match the regex notion of a word character"""
+    return char.isalnum() or char == '_'
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds many keywords in a single pass over the text"""
+
+    def __init__(self, keywords, whole_words=True, case_sensitive=False):
+        self.keywords = list(keywords)
+        self.whole_words = whole_words
+        self.case_sensitive = case_sensitive
+
+        # Trie transitions, failure links and per-state outputs (keyword indices)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        # Word boundaries only apply to keyword edges that are word characters,
+        # mirroring regex \b semantics for entries like 'C++' or '.NET'
+        self._check_left = []
+        self._check_right = []
+        self._lengths = []
+
+        for index, keyword in enumerate(self.keywords):
+            self._add_keyword(self._normalize(keyword), index)
+        self._build_failure_links()
+
+        logger.debug(f"Keyword automaton built with {len(self.keywords)} keywords and {len(self._goto)} states")
+
+    def _normalize(self, text):
+        return text if self.case_sensitive else text.lower()
+
+    def _add_keyword(self, keyword, index):
+        """Insert a keyword into the trie"""
+        self._lengths.append(len(keyword))
+        self._check_left.append(bool(keyword) and _is_word_char(keyword[0]))
+        self._check_right.append(bool(keyword) and _is_word_char(keyword[-1]))
+
+        if not keyword:
+            return
+
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(index)
+
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links, merging outputs along the way"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+
+                if self._output[self._fail[next_state]]:
+                    self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text):
+        """Yield (start, end, keyword_index) for every keyword occurrence in the text"""
+        text = self._normalize(text)
+        text_length = len(text)
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            if not output[state]:
+                continue
+
+            end = position + 1
+            for index in output[state]:
+                start = end - self._lengths[index]
+                if self.whole_words:
+                    if self._check_left[index] and start > 0 and _is_word_char(text[start - 1]):
+                        continue
+                    if self._check_right[index] and end < text_length and _is_word_char(text[end]):
+                        continue
+                yield start, end, index
+
+    def find(self, text):
+        """Return the distinct keywords found in the text, in order of first appearance"""
+        found = {}
+        for _, _, index in self.iter_matches(text):
+            if index not in found:
+                found[index] = self.keywords[index]
+        return list(found.values())
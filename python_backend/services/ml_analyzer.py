@@ -1,25 +1,33 @@
-import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
-import re
 import logging
 from typing import Dict, List, Any
-import joblib
 import os
+import threading
+from datetime import datetime
+
+from services import patterns
+from services.keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
 class MLAnalyzer:
+    # Bump whenever analysis output changes so cached ML results are invalidated
+    VERSION = '1'
+    
+    CORPUS_MODELS_FILE = 'corpus_models.joblib'
+    
     def __init__(self):
-        self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
-        self.scaler = StandardScaler()
+        # scikit-learn and joblib are only imported when corpus models are fitted or loaded
+        self.max_features = 1000
+        self.vectorizer = None
         self.models_path = 'models'
         os.makedirs(self.models_path, exist_ok=True)
         
+        # Corpus TF-IDF/KMeans models fitted offline by train_models.py, loaded once on first use
+        self._corpus_models = None
+        self._corpus_models_loaded = False
+        self._corpus_models_lock = threading.Lock()
+        
         # Industry-specific keywords for classification
         self.industry_keywords = {
             'Technology': ['software', 'programming', 'developer', 'engineer', 'python', 'java', 'javascript', 'react', 'angular', 'node.js', 'database', 'api', 'cloud', 'aws', 'azure'],
@@ -34,30 +42,47 @@ class MLAnalyzer:
         # Quality indicators
         self.quality_indicators = {
             'action_words': ['achieved', 'improved', 'increased', 'developed', 'managed', 'led', 'created', 'implemented', 'optimized', 'designed'],
-            'quantifiable_results': [r'\d+%', r'\$\d+', r'\d+\s*million', r'\d+\s*thousand', r'\d+\s*years?', r'\d+\s*people'],
+            'quantifiable_results': patterns.QUANTIFIABLE_RESULTS,
             'technical_skills': ['programming', 'software', 'database', 'framework', 'algorithm', 'architecture', 'development']
         }
         
+        # Common ATS keywords
+        self.ats_keywords = [
+            'experience', 'skills', 'education', 'achievements', 'results',
+            'leadership', 'management', 'development', 'project', 'team',
+            'analysis', 'communication', 'problem solving', 'innovation'
+        ]
+        
+        # Experience description indicators
+        self.impact_words = ['improved', 'increased', 'reduced', 'optimized', 'enhanced', 'streamlined', 'developed', 'created', 'led', 'managed']
+        self.leadership_words = ['led', 'managed', 'supervised', 'coordinated']
+        
+        # Every keyword family scanned over the resume text, de-duplicated so each is counted once
+        self.text_keywords = list(dict.fromkeys(
+            [keyword for keywords in self.industry_keywords.values() for keyword in keywords] +
+            self.quality_indicators['action_words'] +
+            self.ats_keywords
+        ))
+        self.description_keywords = list(dict.fromkeys(self.impact_words + self.leadership_words))
+        
+        # One automaton pass per text finds every keyword; substring matches, as with `in`,
+        # over text that is already lowercased
+        self.text_matcher = KeywordMatcher(self.text_keywords, whole_words=False, case_sensitive=True)
+        self.description_matcher = KeywordMatcher(self.description_keywords, whole_words=False, case_sensitive=True)
+        
     def analyze_resume(self, parsed_data):
         """Comprehensive ML analysis of resume data"""
         try:
             logger.info("Starting ML analysis of resume")
             
-            # Extract features
-            features = self._extract_features(parsed_data)
+            # Shared per-document values (lowercased text, counts, keyword scan)
+            context = self._build_context(parsed_data)
+            analysis = self._analyze_document(parsed_data, context)
             
-            # Perform different types of analysis
-            analysis = {
-                'features': features,
-                'industry_classification': self._classify_industry(parsed_data),
-                'quality_score': self._calculate_quality_score(parsed_data),
-                'skills_analysis': self._analyze_skills(parsed_data),
-                'experience_analysis': self._analyze_experience(parsed_data),
-                'education_analysis': self._analyze_education(parsed_data),
-                'text_complexity': self._analyze_text_complexity(parsed_data),
-                'keyword_relevance': self._analyze_keyword_relevance(parsed_data),
-                'recommendations': self._generate_ml_recommendations(parsed_data)
-            }
+            # Corpus-relative similarity and cluster, when trained models are available
+            corpus_fit = self._analyze_corpus_fit([context['text_lower']])
+            if corpus_fit:
+                analysis['corpus_fit'] = corpus_fit[0]
             
             # Calculate overall ML score
             analysis['overall_score'] = self._calculate_overall_ml_score(analysis)
@@ -73,15 +98,196 @@ class MLAnalyzer:
                 'recommendations': ['Unable to analyze resume due to processing error']
             }
     
-    def _extract_features(self, parsed_data):
+    def _analyze_document(self, parsed_data, context):
+        """Every per-document sub-analysis, without the corpus fit and overall score"""
+        # Extract features
+        features = self._extract_features(parsed_data, context)
+        industry_classification = self._classify_industry(context)
+        
+        # Perform different types of analysis
+        return {
+            'features': features,
+            'industry_classification': industry_classification,
+            'quality_score': self._calculate_quality_score(parsed_data, context),
+            'skills_analysis': self._analyze_skills(parsed_data),
+            'experience_analysis': self._analyze_experience(parsed_data, context),
+            'education_analysis': self._analyze_education(parsed_data),
+            'text_complexity': self._analyze_text_complexity(parsed_data),
+            'keyword_relevance': self._analyze_keyword_relevance(context),
+            'recommendations': self._generate_ml_recommendations(parsed_data, features, industry_classification)
+        }
+    
+    @property
+    def model_version(self):
+        """Analysis version including the fitted corpus models, for cache keys"""
+        models = self._get_corpus_models()
+        return f"{self.VERSION}-{models['fitted_at']}" if models else self.VERSION
+    
+    def prewarm(self):
+        """Load persisted corpus models, and scikit-learn with them, ahead of the first analysis"""
+        self._get_corpus_models()
+    
+    def fit_corpus_models(self, texts, n_clusters=8):
+        """Fit the TF-IDF vectorizer and KMeans clusterer on a corpus of resume texts"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.cluster import KMeans
+        
+        texts = [text.lower() for text in texts if text and text.strip()]
+        if len(texts) < n_clusters:
+            raise ValueError(f'Need at least {n_clusters} resumes to fit {n_clusters} clusters, got {len(texts)}')
+        
+        logger.info(f"Fitting corpus models on {len(texts)} resumes")
+        vectorizer = TfidfVectorizer(max_features=self.max_features, stop_words='english')
+        matrix = vectorizer.fit_transform(texts)
+        
+        kmeans = KMeans(n_clusters=n_clusters, n_init=10, random_state=42)
+        labels = kmeans.fit_predict(matrix)
+        
+        # Mean document vector, used for similarity to the corpus as a whole
+        corpus_centroid = np.asarray(matrix.mean(axis=0))
+        
+        self.vectorizer = vectorizer
+        with self._corpus_models_lock:
+            self._corpus_models = {
+                'vectorizer': vectorizer,
+                'kmeans': kmeans,
+                'corpus_centroid': corpus_centroid,
+                'cluster_sizes': np.bincount(labels, minlength=n_clusters),
+                'document_count': len(texts),
+                'fitted_at': datetime.utcnow().strftime('%Y%m%d%H%M%S')
+            }
+            self._corpus_models_loaded = True
+        
+        return self._corpus_models
+    
+    def save_corpus_models(self):
+        """Persist fitted corpus models uncompressed, so their arrays can be memory-mapped on load"""
+        import joblib
+        
+        if not self._corpus_models:
+            raise ValueError('No corpus models have been fitted')
+        
+        path = os.path.join(self.models_path, self.CORPUS_MODELS_FILE)
+        temp_path = f"{path}.tmp"
+        joblib.dump(self._corpus_models, temp_path)
+        os.replace(temp_path, path)
+        logger.info(f"Corpus models saved to {path}")
+        return path
+    
+    def _get_corpus_models(self):
+        """Load the persisted corpus models once; None when they have not been trained"""
+        if self._corpus_models_loaded:
+            return self._corpus_models
+        
+        with self._corpus_models_lock:
+            if not self._corpus_models_loaded:
+                path = os.path.join(self.models_path, self.CORPUS_MODELS_FILE)
+                if os.path.exists(path):
+                    try:
+                        import joblib
+                        self._corpus_models = joblib.load(path, mmap_mode='r')
+                        self.vectorizer = self._corpus_models['vectorizer']
+                        logger.info(f"Loaded corpus models fitted at {self._corpus_models['fitted_at']}")
+                    except Exception as e:
+                        logger.error(f"Failed to load corpus models: {str(e)}")
+                self._corpus_models_loaded = True
+        
+        return self._corpus_models
+    
+    def _analyze_corpus_fit(self, texts_lower):
+        """Cluster assignment and corpus-relative similarity for lowercased texts, or None without models"""
+        models = self._get_corpus_models()
+        if not models:
+            return None
+        
+        from sklearn.metrics.pairwise import cosine_similarity
+        
+        matrix = models['vectorizer'].transform(texts_lower)
+        kmeans = models['kmeans']
+        clusters = kmeans.predict(matrix)
+        
+        cluster_similarity = cosine_similarity(matrix, kmeans.cluster_centers_)
+        corpus_similarity = cosine_similarity(matrix, models['corpus_centroid'])[:, 0]
+        
+        return [
+            {
+                'cluster': int(cluster),
+                'cluster_size': int(models['cluster_sizes'][cluster]),
+                'cluster_similarity': round(float(cluster_similarity[row, cluster]), 4),
+                'corpus_similarity': round(float(corpus_similarity[row]), 4),
+                'models_fitted_at': models['fitted_at']
+            }
+            for row, cluster in enumerate(clusters)
+        ]
+    
+    def _build_context(self, parsed_data):
+        """Compute the per-document values every sub-analysis reads, in one pass over each text"""
+        raw_text = parsed_data.get('raw_text', '')
+        text_lower = raw_text.lower()
+        
+        experience = parsed_data.get('experience', [])
+        descriptions_lower = ' '.join([exp.get('description', '') for exp in experience]).lower()
+        
+        # Industry, action-word and ATS keywords come from a single scan; occurrences are counted
+        # without overlaps, as str.count does
+        counts = [0] * len(self.text_keywords)
+        last_end = [0] * len(self.text_keywords)
+        for start, end, index in self.text_matcher.iter_matches(text_lower):
+            if start >= last_end[index]:
+                counts[index] += 1
+                last_end[index] = end
+        keyword_counts = dict(zip(self.text_keywords, counts))
+        
+        description_found = set(self.description_matcher.find(descriptions_lower))
+        
+        return {
+            'text_lower': text_lower,
+            'text_length': len(raw_text),
+            'word_count': len(text_lower.split()),
+            'line_count': raw_text.count('\n') + 1,
+            'keyword_present': {keyword: count > 0 for keyword, count in keyword_counts.items()},
+            'ats_counts': {keyword: keyword_counts[keyword] for keyword in self.ats_keywords},
+            'descriptions_length': len(descriptions_lower),
+            'description_present': {keyword: keyword in description_found for keyword in self.description_keywords}
+        }
+    
+    def analyze_batch(self, parsed_list):
+        """ML analysis of many resumes; each result matches analyze_resume for that resume
+
+        Documents are analyzed one by one: the per-document keyword scans and regexes are
+        the cost, and batching them measured no faster. Only the corpus fit runs once for
+        the whole batch, as a single TF-IDF transform.
+        """
+        if not parsed_list:
+            return []
+        
+        try:
+            logger.info(f"Starting batch ML analysis of {len(parsed_list)} resumes")
+            contexts = [self._build_context(parsed_data) for parsed_data in parsed_list]
+            analyses = [self._analyze_document(parsed_data, context) for parsed_data, context in zip(parsed_list, contexts)]
+            
+            corpus_fits = self._analyze_corpus_fit([context['text_lower'] for context in contexts])
+            for analysis, corpus_fit in zip(analyses, corpus_fits or []):
+                analysis['corpus_fit'] = corpus_fit
+            
+            for analysis in analyses:
+                analysis['overall_score'] = self._calculate_overall_ml_score(analysis)
+            
+            logger.info(f"Batch ML analysis completed for {len(analyses)} resumes")
+            return analyses
+            
+        except Exception as e:
+            logger.error(f"Batch ML analysis error, falling back to per-resume analysis: {str(e)}")
+            return [self.analyze_resume(parsed_data) for parsed_data in parsed_list]
+    
+    def _extract_features(self, parsed_data, context):
         """Extract numerical features from parsed resume data"""
         features = {}
         
         # Text-based features
-        raw_text = parsed_data.get('raw_text', '')
-        features['text_length'] = len(raw_text)
-        features['word_count'] = len(raw_text.split())
-        features['line_count'] = len(raw_text.split('\n'))
+        features['text_length'] = context['text_length']
+        features['word_count'] = context['word_count']
+        features['line_count'] = context['line_count']
         
         # Experience features
         experience = parsed_data.get('experience', [])
@@ -113,13 +319,13 @@ class MLAnalyzer:
         
         return features
     
-    def _classify_industry(self, parsed_data):
+    def _classify_industry(self, context):
         """Classify resume into industry categories"""
-        raw_text = parsed_data.get('raw_text', '').lower()
+        keyword_present = context['keyword_present']
         industry_scores = {}
         
         for industry, keywords in self.industry_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in raw_text)
+            score = sum(1 for keyword in keywords if keyword_present[keyword])
             industry_scores[industry] = score
         
         # Find top industries
@@ -131,18 +337,19 @@ class MLAnalyzer:
             'confidence': sorted_industries[0][1] / max(sum(industry_scores.values()), 1)
         }
     
-    def _calculate_quality_score(self, parsed_data):
+    def _calculate_quality_score(self, parsed_data, context):
         """Calculate resume quality score using ML features"""
-        raw_text = parsed_data.get('raw_text', '').lower()
+        raw_text = context['text_lower']
+        keyword_present = context['keyword_present']
         score_components = {}
         
         # Action words score (0-25 points)
-        action_word_count = sum(1 for word in self.quality_indicators['action_words'] if word in raw_text)
+        action_word_count = sum(1 for word in self.quality_indicators['action_words'] if keyword_present[word])
         score_components['action_words'] = min(action_word_count * 3, 25)
         
         # Quantifiable results score (0-25 points)
         quantifiable_count = sum(1 for pattern in self.quality_indicators['quantifiable_results'] 
-                                if re.search(pattern, raw_text))
+                                if pattern.search(raw_text))
         score_components['quantifiable_results'] = min(quantifiable_count * 5, 25)
         
         # Technical skills score (0-20 points)
@@ -221,19 +428,16 @@ class MLAnalyzer:
             'top_category': max(skill_categories.items(), key=lambda x: len(x[1]))[0]
         }
     
-    def _analyze_experience(self, parsed_data):
+    def _analyze_experience(self, parsed_data, context):
         """Analyze work experience using ML"""
         experience = parsed_data.get('experience', [])
         
         if not experience:
             return {'experience_analysis': 'No experience detected'}
         
-        # Analyze experience descriptions
-        all_descriptions = ' '.join([exp.get('description', '') for exp in experience])
-        
-        # Count impact words
-        impact_words = ['improved', 'increased', 'reduced', 'optimized', 'enhanced', 'streamlined', 'developed', 'created', 'led', 'managed']
-        impact_count = sum(1 for word in impact_words if word in all_descriptions.lower())
+        # Count impact words in the experience descriptions
+        description_present = context['description_present']
+        impact_count = sum(1 for word in self.impact_words if description_present[word])
         
         # Analyze job progression
         job_titles = [exp.get('title', '') for exp in experience]
@@ -251,8 +455,8 @@ class MLAnalyzer:
             'total_positions': len(experience),
             'impact_words_count': impact_count,
             'progression_score': progression_score,
-            'avg_description_length': len(all_descriptions) / len(experience) if experience else 0,
-            'has_leadership_experience': any(word in all_descriptions.lower() for word in ['led', 'managed', 'supervised', 'coordinated'])
+            'avg_description_length': context['descriptions_length'] / len(experience) if experience else 0,
+            'has_leadership_experience': any(description_present[word] for word in self.leadership_words)
         }
     
     def _analyze_education(self, parsed_data):
@@ -314,43 +518,40 @@ class MLAnalyzer:
             'assessment': 'Well-balanced' if 60 <= normalized_score <= 80 else 'Needs improvement'
         }
     
-    def _analyze_keyword_relevance(self, parsed_data):
+    def _analyze_keyword_relevance(self, context):
         """Analyze keyword relevance for ATS systems"""
-        raw_text = parsed_data.get('raw_text', '').lower()
+        keyword_density = self._keyword_density(context)
         
-        # Common ATS keywords
-        ats_keywords = [
-            'experience', 'skills', 'education', 'achievements', 'results',
-            'leadership', 'management', 'development', 'project', 'team',
-            'analysis', 'communication', 'problem solving', 'innovation'
-        ]
+        # Calculate ATS compatibility score
+        ats_score = min(sum(1 for kw, data in keyword_density.items() if data['count'] > 0) * 5, 100)
         
+        return {
+            'keyword_density': keyword_density,
+            'ats_compatibility_score': ats_score,
+            'total_keywords_found': sum(1 for kw, data in keyword_density.items() if data['count'] > 0)
+        }
+    
+    def _keyword_density(self, context):
+        """Count and density (% of words) of each ATS keyword"""
+        ats_counts = context['ats_counts']
         keyword_density = {}
-        total_words = len(raw_text.split())
+        total_words = context['word_count']
         
-        for keyword in ats_keywords:
-            count = raw_text.count(keyword)
+        for keyword in self.ats_keywords:
+            count = ats_counts[keyword]
             density = (count / total_words) * 100 if total_words > 0 else 0
             keyword_density[keyword] = {
                 'count': count,
                 'density': round(density, 2)
             }
         
-        # Calculate ATS compatibility score
-        ats_score = min(sum(1 for kw, data in keyword_density.items() if data['count'] > 0) * 5, 100)
-        
-        return {
-            'keyword_density': keyword_density,
-            'ats_compatibility_score': ats_score,
-            'total_keywords_found': sum(1 for kw, data in keyword_density.items() if data['count'] > 0)
-        }
+        return keyword_density
     
-    def _generate_ml_recommendations(self, parsed_data):
+    def _generate_ml_recommendations(self, parsed_data, features, industry_analysis):
         """Generate ML-based recommendations"""
         recommendations = []
         
-        # Analyze features and provide recommendations
-        features = self._extract_features(parsed_data)
+        # Provide recommendations from the already extracted features
         
         if features['quantifiable_achievements'] < 3:
             recommendations.append("Add more quantifiable achievements with specific numbers and percentages")
@@ -367,7 +568,6 @@ class MLAnalyzer:
             recommendations.append("Use shorter, more concise sentences for better readability")
         
         # Industry-specific recommendations
-        industry_analysis = self._classify_industry(parsed_data)
         if industry_analysis['confidence'] < 0.3:
             recommendations.append("Focus on industry-specific keywords to improve relevance")
         
@@ -0,0 +1,235 @@
+import os
+import signal
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from services.resume_parser import ResumeParser
+
+logger = logging.getLogger(__name__)
+
+# Parser owned by each worker process, built once by the pool initializer
+_worker_parser = None
+
+WARM_UP_TEXT = """John Smith
+john.smith@example.com
+Senior Software Engineer
+Example Corp 2018 - present
+Developed Python services and improved throughput by 40% for a team of 12 people.
+Education
+Bachelor of Science in Computer Science, State University 2016
+"""
+
+
+def parser_options_from_env():
+    """ResumeParser options configured through the environment, shared by the backend and
+    bulk_import.py so both parse alike"""
+    def enabled(name, default):
+        return os.getenv(name, default).lower() in ('1', 'true', 'yes')
+
+    return {
+        'spill_threshold': int(os.getenv('UPLOAD_SPILL_THRESHOLD', 8 * 1024 * 1024)),
+        'text_stats_engine': os.getenv('TEXT_STATS_ENGINE', 'fast'),
+        'pos_tagging': enabled('TEXT_STATS_POS_TAGGING', 'true'),
+        'pdf_workers': int(os.getenv('PDF_EXTRACT_WORKERS', 0)),
+        'pdf_parallel_min_pages': int(os.getenv('PDF_PARALLEL_MIN_PAGES', 32)),
+        'pdf_layout': enabled('PDF_LAYOUT_BLOCKS', 'false'),
+        'max_upload_bytes': int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024)),
+        'max_unpacked_bytes': int(os.getenv('MAX_UNPACKED_BYTES', 64 * 1024 * 1024)),
+        'max_pages': int(os.getenv('MAX_RESUME_PAGES', 50)),
+        'max_text_chars': int(os.getenv('MAX_RESUME_TEXT_CHARS', 200000)),
+        'extraction_time_budget': float(os.getenv('EXTRACTION_TIME_BUDGET', 15))
+    }
+
+
+class _ParseTimeout(BaseException):
+    """Raised in a worker by its parse alarm; a BaseException so the parser's own error handling cannot swallow it"""
+
+
+def _raise_parse_timeout(signum, frame):
+    raise _ParseTimeout()
+
+
+def _init_worker(parser_options):
+    """Build the skills automaton once per worker process"""
+    global _worker_parser
+    _worker_parser = ResumeParser(**parser_options)
+    signal.signal(signal.SIGALRM, _raise_parse_timeout)
+
+
+def _warm_up_worker():
+    """Run a small document through the parser so lazily loaded models are resident"""
+    try:
+        _worker_parser.prewarm()
+        _worker_parser._parse_resume_text(WARM_UP_TEXT)
+    except Exception as e:
+        logger.warning(f"Parser worker warm-up failed: {str(e)}")
+    return os.getpid()
+
+
+def _parse_upload_in_worker(upload, parse_timeout):
+    """Parse with a hard time limit: tasks run on the worker's main thread, so SIGALRM interrupts
+    the parse wherever it is in Python code and the worker is free for the next upload"""
+    try:
+        if parse_timeout:
+            signal.setitimer(signal.ITIMER_REAL, parse_timeout)
+        try:
+            return _worker_parser.parse_upload(upload)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    except _ParseTimeout:
+        logger.error(f"Resume parsing timed out after {parse_timeout}s")
+        return {
+            'success': False,
+            'message': 'Resume parsing timed out'
+        }
+
+
+class ParserPoolBusy(Exception):
+    """Raised when the parsing backlog is full and the caller should retry later"""
+
+
+class ParserPool:
+    """Pre-warmed process pool that runs CPU-bound resume extraction off the request thread"""
+
+    # Seconds the caller waits past parse_timeout for the worker's own timeout result
+    PARSE_TIMEOUT_GRACE = 5
+
+    def __init__(self, parser_options=None, workers=None, max_pending=None, submit_timeout=5, parse_timeout=120):
+        self.parser_options = parser_options or {}
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.max_pending = max_pending or self.workers * 4
+        self.submit_timeout = submit_timeout
+        self.parse_timeout = parse_timeout
+
+        # Bounded backlog: callers wait up to submit_timeout for a slot, then get ParserPoolBusy
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+        if self.workers > 0:
+            if 'fork' not in multiprocessing.get_all_start_methods():
+                logger.warning("Process pool requires the 'fork' start method; parsing inline instead")
+            else:
+                self._executor = self._create_executor()
+
+        # Reads uploads, and parses them when there are no workers. Inline parsing runs on
+        # request threads, which must never fork the parallel PDF page pool.
+        parser_options = self.parser_options
+        if self._executor is None and parser_options.get('pdf_workers', 0) > 1:
+            logger.warning("Parsing inline; parallel PDF extraction is disabled")
+            parser_options = dict(parser_options, pdf_workers=0)
+        self.parser = ResumeParser(**parser_options)
+
+    def _create_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_worker,
+            initargs=(self.parser_options,)
+        )
+
+    def _reset_executor(self, executor):
+        """Replace a pool broken by a dead worker (segfault, OOM kill) with a fresh, prewarmed one"""
+        with self._executor_lock:
+            if self._executor is not executor:
+                # Another caller already replaced it, or the pool was shut down
+                return
+            logger.error("A parser worker died; restarting the parser pool")
+            self._executor = self._create_executor()
+            self.prewarm()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def inline(self):
+        """True when uploads are parsed on the calling thread instead of worker processes"""
+        return self._executor is None
+
+    def start(self):
+        """Fork every worker now, from the calling thread
+
+        The executor forks all its workers on the first submission, before starting its own
+        management thread; calling this before any other thread exists keeps the fork safe.
+        """
+        if self._executor is not None:
+            self._executor.submit(os.getpid).result()
+
+    def prewarm(self):
+        """Load models in every worker ahead of the first upload rather than during it"""
+        if self._executor is None:
+            self.parser.prewarm()
+            return
+
+        futures = [self._executor.submit(_warm_up_worker) for _ in range(self.workers)]
+
+        def _log_ready(future):
+            if all(f.done() for f in futures):
+                logger.info(f"✅ Parser pool ready with {self.workers} worker processes")
+
+        for future in futures:
+            future.add_done_callback(_log_ready)
+
+    def submit(self, upload):
+        """Queue an upload for parsing and return a future with the parse result"""
+        return self._submit(upload)[1]
+
+    def _submit(self, upload):
+        """(executor, future) for an upload queued on the pool, restarting the pool if a worker died"""
+        if not self._slots.acquire(timeout=self.submit_timeout):
+            raise ParserPoolBusy('Resume parser is busy, please retry shortly')
+
+        try:
+            executor = self._executor
+            try:
+                future = executor.submit(_parse_upload_in_worker, upload, self.parse_timeout)
+            except BrokenProcessPool:
+                self._reset_executor(executor)
+                executor = self._executor
+                future = executor.submit(_parse_upload_in_worker, upload, self.parse_timeout)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return executor, future
+
+    def parse_upload(self, upload):
+        """Parse an upload produced by ResumeParser.read_upload on the pool"""
+        if self._executor is None:
+            return self.parser.parse_upload(upload)
+
+        executor, future = self._submit(upload)
+        try:
+            # The worker enforces parse_timeout itself; the grace period only covers a worker
+            # stuck inside native code, which keeps its slot until the alarm lands
+            return future.result(timeout=self.parse_timeout + self.PARSE_TIMEOUT_GRACE if self.parse_timeout else None)
+        except FutureTimeoutError:
+            logger.error(f"Resume parsing did not return within {self.parse_timeout + self.PARSE_TIMEOUT_GRACE}s")
+            return {
+                'success': False,
+                'message': 'Resume parsing timed out'
+            }
+        except BrokenProcessPool as e:
+            # The worker died mid-parse, possibly on this very upload; the next one gets a fresh pool
+            self._reset_executor(executor)
+            logger.error(f"Resume parsing error: {str(e)}")
+            return {
+                'success': False,
+                'message': 'Failed to parse resume',
+                'error': 'Parser worker died'
+            }
+        except Exception as e:
+            logger.error(f"Resume parsing error: {str(e)}")
+            return {
+                'success': False,
+                'message': 'Failed to parse resume',
+                'error': str(e)
+            }
+
+    def shutdown(self, wait=True):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
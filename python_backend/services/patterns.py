@@ -0,0 +1,73 @@
+import re
+
+# Regular expressions used by ResumeParser and MLAnalyzer, compiled once at import
+
+# Personal information
+EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+LINKEDIN = re.compile(r'linkedin\.com/in/[\w-]+', re.IGNORECASE)
+
+# Section headers: short lines naming a resume section, mapped to the section they open
+SECTION_HEADERS = {
+    'education': 'education', 'educational': 'education', 'academic': 'education', 'academics': 'education',
+    'qualification': 'education', 'qualifications': 'education',
+    'experience': 'experience', 'employment': 'experience', 'work history': 'experience',
+    'career history': 'experience', 'professional background': 'experience',
+    'skills': 'skills', 'competencies': 'skills', 'technologies': 'skills',
+    'summary': 'summary', 'profile': 'summary', 'objective': 'summary', 'about me': 'summary',
+    'projects': 'projects',
+    'certifications': 'certifications', 'certificates': 'certifications', 'licenses': 'certifications',
+    'awards': 'other', 'honors': 'other', 'publications': 'other', 'references': 'other',
+    'interests': 'other', 'languages': 'other', 'volunteering': 'other', 'activities': 'other'
+}
+# Words that may precede a section name ("Professional Experience", "Technical Skills")
+SECTION_HEADER_QUALIFIERS = [
+    'professional', 'work', 'technical', 'relevant', 'core', 'key', 'career',
+    'academic', 'personal', 'additional', 'selected', 'other'
+]
+# Words that may follow a section name ("Employment History", "Skills Summary")
+SECTION_HEADER_SUFFIXES = ['history', 'background', 'summary', 'profile']
+# The whole line must be the header, optionally qualified, joined with one more topic
+# ("Honors & Awards", "Education and Training") and followed by a colon; a line that
+# merely starts with a section name ("Skills Development Manager") is not a header
+SECTION_HEADER = re.compile(
+    r'(?:(?:' + '|'.join(SECTION_HEADER_QUALIFIERS) + r')\s+)?'
+    r'(' + '|'.join(sorted(map(re.escape, SECTION_HEADERS), key=len, reverse=True)) + r')'
+    r'(?:\s+(?:' + '|'.join(SECTION_HEADER_SUFFIXES) + r'))?'
+    r'(?:\s*(?:&|and)\s*[a-z]+(?:\s+[a-z]+)?)?\s*:?',
+    re.IGNORECASE
+)
+SECTION_HEADER_MAX_LENGTH = 40
+
+# Education and experience entries
+DEGREE = re.compile(r'(bachelor|master|phd|b\.?[as]|m\.?[as]|ph\.?d)')
+YEAR = re.compile(r'(?:19|20)\d{2}')
+INSTITUTION = re.compile(r'university|college|institute|school|academy', re.IGNORECASE)
+DURATION = re.compile(r'(\d{4})\s*[-–]\s*(\d{4}|present|current)', re.IGNORECASE)
+
+# Skills section
+SKILLS_SECTION = re.compile(r'skills?\s*:?\s*(.*?)(?=\n\s*\n|\n[A-Z]|$)', re.IGNORECASE | re.DOTALL)
+SKILL_DELIMITERS = re.compile(r'[,;•\n\t]+')
+
+# Quantified achievements; every alternative has exactly two groups (value, unit)
+METRIC_PATTERNS = [
+    r'\$?(\d+(?:,\d{3})*(?:\.\d+)?)\s*(million|billion|k|thousand|%|percent)',
+    r'(\d+(?:\.\d+)?)\s*(years?|months?|weeks?)',
+    r'(\d+)(?:\+|\s+or\s+more|\s+plus)?\s*(people|team|members|employees)',
+    r'improved?\s+by\s+(\d+(?:\.\d+)?)(%|percent|times|x)',
+    r'increased?\s+by\s+(\d+(?:\.\d+)?)(%|percent|times|x)',
+    r'reduced?\s+by\s+(\d+(?:\.\d+)?)(%|percent|times|x)'
+]
+
+# The lookahead lets the scanner skip every position that cannot start an alternative
+METRIC = re.compile(
+    r'(?=[\d$ir])(?:' + '|'.join(f'(?:{pattern})' for pattern in METRIC_PATTERNS) + ')',
+    re.IGNORECASE
+)
+
+# Kept as separate patterns: MLAnalyzer counts how many kinds of result are present,
+# which a single consuming alternation would undercount ("$5 million")
+QUANTIFIABLE_RESULTS = [
+    re.compile(pattern)
+    for pattern in [r'\d+%', r'\$\d+', r'\d+\s*million', r'\d+\s*thousand', r'\d+\s*years?', r'\d+\s*people']
+]
@@ -0,0 +1,89 @@
+import copy
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+def hash_bytes(data):
+    """SHA-256 hex digest of raw bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text):
+    """SHA-256 hex digest of text exactly as given: line breaks and spacing change ML features"""
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """Content-addressed result cache: an in-process LRU in front of a Mongo collection with TTL"""
+
+    def __init__(self, collection=None, ttl_seconds=30 * 24 * 3600, lru_size=256):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.lru_size = lru_size
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ensure_ttl_index(self):
+        """Create the expiry index; kept out of __init__ so an unreachable database does not block startup"""
+        if self.collection is None:
+            return
+
+        try:
+            self.collection.create_index('created_at', expireAfterSeconds=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Could not create cache TTL index: {str(e)}")
+
+    @staticmethod
+    def make_key(namespace, *parts):
+        """Build a cache key from a stage name and the versions/hashes it depends on"""
+        return ':'.join([namespace] + [str(part) for part in parts])
+
+    def get(self, key):
+        """Return a copy of the cached value, or None on a miss"""
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                return copy.deepcopy(self._lru[key])
+
+        if self.collection is None:
+            return None
+
+        try:
+            document = self.collection.find_one({'_id': key})
+        except Exception as e:
+            logger.warning(f"Cache lookup failed for {key}: {str(e)}")
+            return None
+
+        if not document:
+            return None
+
+        self._remember(key, document['value'])
+        return copy.deepcopy(document['value'])
+
+    def set(self, key, value):
+        """Store a value in the LRU and the backing collection"""
+        self._remember(key, copy.deepcopy(value))
+
+        if self.collection is None:
+            return
+
+        try:
+            self.collection.replace_one(
+                {'_id': key},
+                {'_id': key, 'value': value, 'created_at': datetime.utcnow()},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {str(e)}")
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._lru[key] = value
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
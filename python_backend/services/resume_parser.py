@@ -1,140 +1,478 @@
+import io
 import os
-import re
 import json
-import pandas as pd
-import numpy as np
+import time
+import signal
+import hashlib
+import zipfile
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-import fitz  # PyMuPDF
-from docx import Document
 import logging
 from typing import Dict, List, Any
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
-from nltk.chunk import ne_chunk
-from nltk.tag import pos_tag
-import textstat
-
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-    
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-try:
-    nltk.data.find('taggers/averaged_perceptron_tagger')
-except LookupError:
-    nltk.download('averaged_perceptron_tagger')
-
-try:
-    nltk.data.find('chunkers/maxent_ne_chunker')
-except LookupError:
-    nltk.download('maxent_ne_chunker')
-
-try:
-    nltk.data.find('corpora/words')
-except LookupError:
-    nltk.download('words')
+
+from services import patterns
+from services.docx_text import iter_docx_paragraphs
+from services.keyword_matcher import KeywordMatcher
+from services.text_stats import TEXT_STATS_ENGINES, analyze_text, get_pos_tagger
+
+# NLTK, PyMuPDF and textstat are imported on first use so that importing
+# this module stays cheap; ResumeParser.prewarm() loads them ahead of the first upload
+NLTK_RESOURCES = [
+    ('tokenizers/punkt', 'punkt'),
+    ('corpora/stopwords', 'stopwords'),
+    ('taggers/averaged_perceptron_tagger', 'averaged_perceptron_tagger'),
+    ('chunkers/maxent_ne_chunker', 'maxent_ne_chunker'),
+    ('corpora/words', 'words')
+]
+
+_nltk_ready = False
+_nltk_lock = threading.Lock()
+
+
+def ensure_nltk_resources():
+    """Find, or download once, the NLTK data the parser uses"""
+    global _nltk_ready
+    if _nltk_ready:
+        return
+
+    with _nltk_lock:
+        if not _nltk_ready:
+            import nltk
+            for resource_path, package in NLTK_RESOURCES:
+                try:
+                    nltk.data.find(resource_path)
+                except LookupError:
+                    nltk.download(package)
+            _nltk_ready = True
 
 logger = logging.getLogger(__name__)
 
+
+class DocumentLimitExceeded(Exception):
+    """Raised when an upload exceeds a configured size, content or time limit"""
+
+
+class _ExtractionBudget:
+    """Page, character and wall-clock limits for extracting one document, consumed incrementally"""
+
+    def __init__(self, max_pages=None, max_chars=None, time_budget=None):
+        self.max_pages = max_pages
+        self.remaining_chars = max_chars or None
+        self.deadline = time.monotonic() + time_budget if time_budget else None
+        self.time_budget = time_budget
+        self.truncated = False
+
+    @property
+    def exhausted(self):
+        return self.remaining_chars is not None and self.remaining_chars <= 0
+
+    def remaining_time(self):
+        """Seconds left before the deadline, or None without a time budget"""
+        return max(self.deadline - time.monotonic(), 0) if self.deadline else None
+
+    def check_time(self):
+        if self.deadline and time.monotonic() > self.deadline:
+            raise DocumentLimitExceeded(f'Text extraction exceeded the {self.time_budget:g}s time budget')
+
+    def pages(self, page_count):
+        """Number of pages to extract out of page_count"""
+        if self.max_pages and page_count > self.max_pages:
+            self.truncated = True
+            return self.max_pages
+        return page_count
+
+    def take(self, text):
+        """The part of text that still fits in the character limit"""
+        if self.remaining_chars is None:
+            return text
+        if len(text) > self.remaining_chars:
+            self.truncated = True
+            text = text[:self.remaining_chars]
+        self.remaining_chars -= len(text)
+        return text
+
+
+def _open_pdf(source):
+    """Open a PDF from an upload's spill file or in-memory bytes"""
+    import fitz  # PyMuPDF
+    if source['path']:
+        return fitz.open(source['path'])
+    return fitz.open(stream=source['data'], filetype='pdf')
+
+
+# Layout mode: a page is read as two columns only when each half holds at least
+# COLUMN_MIN_BLOCKS blocks and the right half is a column of its own rather than dates or
+# locations on the lines of left-hand entries; blocks whose tops lie within ROW_TOLERANCE
+# points share a line, and a column's blocks start within COLUMN_ALIGN_TOLERANCE points
+COLUMN_MIN_BLOCKS = 3
+ROW_TOLERANCE = 3
+COLUMN_ALIGN_TOLERANCE = 10
+
+
+def _is_two_column(blocks, middle):
+    """True when the blocks (x0, y0, x1, y1, ...) lay out as a left and a right column"""
+    left = [block for block in blocks if block[2] <= middle]
+    right = [block for block in blocks if block[0] >= middle]
+    if len(left) < COLUMN_MIN_BLOCKS or len(right) < COLUMN_MIN_BLOCKS:
+        return False
+    
+    # A text column is left-aligned; right-aligned dates have ragged starts
+    column_start = min(block[0] for block in right)
+    aligned = sum(1 for block in right if block[0] - column_start <= COLUMN_ALIGN_TOLERANCE)
+    if aligned * 3 < len(right) * 2:
+        return False
+    
+    # Dates and locations of a single column share their line with the entry they belong to
+    on_left_rows = sum(
+        1 for block in right if any(abs(block[1] - other[1]) <= ROW_TOLERANCE for other in left)
+    )
+    return on_left_rows * 2 < len(right)
+
+
+def _reading_order(blocks, width):
+    """Blocks in reading order: column by column on two-column pages, else line by line"""
+    middle = width / 2
+    if _is_two_column(blocks, middle):
+        # Blocks entirely in the right half belong to the second column, read after the left one
+        return sorted(blocks, key=lambda block: (block[0] >= middle, block[1], block[0]))
+    
+    # Top to bottom, left to right within a line, so right-aligned dates follow their title
+    ordered, row = [], []
+    for block in sorted(blocks, key=lambda block: block[1]):
+        if row and block[1] - row[0][1] > ROW_TOLERANCE:
+            ordered.extend(sorted(row, key=lambda block: block[0]))
+            row = []
+        row.append(block)
+    ordered.extend(sorted(row, key=lambda block: block[0]))
+    return ordered
+
+
+def _page_text(page, layout=False):
+    """Text of one PDF page; in layout mode built from text blocks in column-aware reading order"""
+    if not layout:
+        return page.get_text()
+    
+    blocks = [block for block in page.get_text('blocks') if block[6] == 0 and block[4].strip()]
+    blocks = _reading_order(blocks, page.rect.width)
+    
+    # Blank lines between blocks keep paragraph and section boundaries visible to the parser
+    return '\n\n'.join(block[4].strip() for block in blocks) + '\n\n'
+
+
+# Long-lived pool splitting large PDFs across processes, started on first use in the process that
+# parses (a parser pool worker); its workers stay for the life of that process
+_page_executor = None
+_page_executor_lock = threading.Lock()
+
+# Seconds the parent waits past the time budget for a page worker's own timeout
+PAGE_TIMEOUT_GRACE = 5
+
+
+def _raise_page_timeout(signum, frame):
+    raise DocumentLimitExceeded('Text extraction exceeded the time budget')
+
+
+def _init_page_worker():
+    signal.signal(signal.SIGALRM, _raise_page_timeout)
+
+
+def _get_page_executor(workers):
+    global _page_executor
+    with _page_executor_lock:
+        if _page_executor is None:
+            _page_executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=_init_page_worker
+            )
+        return _page_executor
+
+
+def _reset_page_executor(executor):
+    """Drop a broken page pool so the next large PDF starts a fresh one"""
+    global _page_executor
+    with _page_executor_lock:
+        if _page_executor is executor:
+            _page_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _pdf_page_texts(source, start, stop, layout=False, time_limit=None):
+    """Text of pages [start, stop); runs in page pool workers, which stop themselves at time_limit"""
+    try:
+        if time_limit:
+            signal.setitimer(signal.ITIMER_REAL, time_limit)
+        with _open_pdf(source) as doc:
+            return [_page_text(doc[number], layout) for number in range(start, stop)]
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
 class ResumeParser:
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
+    # Bump whenever parsed output changes so cached parse results are invalidated
+    VERSION = '10'
+    READ_CHUNK_SIZE = 64 * 1024
+    DEFAULT_SPILL_THRESHOLD = 8 * 1024 * 1024
+    DEFAULT_MAX_UPLOAD_BYTES = 16 * 1024 * 1024
+    MAX_DESCRIPTION_LINES = 4
+    MAX_JOB_TITLE_LENGTH = 60
+    
+    def __init__(self, spill_threshold=None, spill_dir=None, text_stats_engine='fast', pos_tagging=True,
+                 pdf_workers=0, pdf_parallel_min_pages=32, pdf_layout=False, max_upload_bytes=None,
+                 max_unpacked_bytes=64 * 1024 * 1024, max_pages=50, max_text_chars=200000, extraction_time_budget=15):
+        # Uploads larger than this are written to a temp file instead of kept in memory
+        self.spill_threshold = spill_threshold if spill_threshold is not None else self.DEFAULT_SPILL_THRESHOLD
+        self.spill_dir = spill_dir
+        if text_stats_engine not in TEXT_STATS_ENGINES:
+            raise ValueError(f"Unknown text statistics engine '{text_stats_engine}', expected one of {TEXT_STATS_ENGINES}")
+        self.text_stats_engine = text_stats_engine
+        self.pos_tagging = pos_tagging
+        # PDFs with at least pdf_parallel_min_pages pages are split across pdf_workers forked
+        # processes. Only single-threaded parser pool workers should fork, so ParserPool turns
+        # this off for the parser it runs inline in the multi-threaded web process.
+        if pdf_workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            logger.warning("Parallel PDF extraction requires the 'fork' start method; extracting pages serially")
+            pdf_workers = 0
+        self.pdf_workers = pdf_workers
+        self.pdf_parallel_min_pages = pdf_parallel_min_pages
+        self.pdf_layout = pdf_layout
+        # Limits against oversized or hostile uploads; 0 or None disables a limit. Uploads over
+        # max_upload_bytes (or DOCX archives over max_unpacked_bytes) and extraction past the
+        # time budget are rejected; documents over max_pages or max_text_chars are truncated
+        self.max_upload_bytes = max_upload_bytes if max_upload_bytes is not None else self.DEFAULT_MAX_UPLOAD_BYTES
+        self.max_unpacked_bytes = max_unpacked_bytes
+        self.max_pages = max_pages
+        self.max_text_chars = max_text_chars
+        self.extraction_time_budget = extraction_time_budget
+        self._stop_words = None
         self.skills_database = self._load_skills_database()
+        self.skill_matcher = KeywordMatcher(self.skills_database, whole_words=True)
         self.education_keywords = ['university', 'college', 'institute', 'school', 'bachelor', 'master', 'phd', 'degree', 'diploma', 'certificate']
         self.experience_keywords = ['experience', 'work', 'employment', 'career', 'position', 'role', 'job']
         
-    def parse_resume(self, file):
-        """Parse resume file and extract structured data"""
+    @property
+    def stop_words(self):
+        """English stopwords, loaded from NLTK on first use"""
+        if self._stop_words is None:
+            ensure_nltk_resources()
+            from nltk.corpus import stopwords
+            self._stop_words = set(stopwords.words('english'))
+        return self._stop_words
+    
+    def prewarm(self):
+        """Import the document libraries and load NLTK data and models before the first upload"""
+        import fitz  # noqa: F401
+        self._analyze_text('Prewarm the tokenizer and tagger.')
+    
+    @property
+    def options_key(self):
+        """Options that change parse output, for cache keys alongside VERSION"""
+        return ':'.join(str(option) for option in (
+            self.text_stats_engine, self.pos_tagging, self.pdf_layout,
+            self.max_unpacked_bytes, self.max_pages, self.max_text_chars, self.extraction_time_budget
+        ))
+    
+    def read_upload(self, file):
+        """Read an uploaded file into memory, spilling to a temp file past the threshold"""
+        filename = file.filename
+        buffer = io.BytesIO()
+        spill_file = None
+        size = 0
+        digest = hashlib.sha256()
+        
+        try:
+            while True:
+                chunk = file.read(self.READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if self.max_upload_bytes and size > self.max_upload_bytes:
+                    if spill_file is not None:
+                        spill_file.close()
+                        os.remove(spill_file.name)
+                        spill_file = None
+                    raise DocumentLimitExceeded(f'Uploads are limited to {self.max_upload_bytes / (1024 * 1024):g} MB')
+                digest.update(chunk)
+                
+                if spill_file is None and size > self.spill_threshold:
+                    suffix = os.path.splitext(filename)[1].lower()
+                    spill_file = tempfile.NamedTemporaryFile(prefix='resume_', suffix=suffix, dir=self.spill_dir, delete=False)
+                    spill_file.write(buffer.getvalue())
+                    buffer = None
+                
+                (spill_file or buffer).write(chunk)
+        finally:
+            if spill_file is not None:
+                spill_file.close()
+        
+        return {
+            'filename': filename,
+            'size': size,
+            'sha256': digest.hexdigest(),
+            'data': buffer.getvalue() if spill_file is None else None,
+            'path': spill_file.name if spill_file is not None else None
+        }
+    
+    def release_upload(self, upload):
+        """Remove the spill file of an upload, if one was written"""
+        if upload and upload.get('path'):
+            try:
+                os.remove(upload['path'])
+            except OSError as e:
+                logger.warning(f"Could not remove spilled upload {upload['path']}: {str(e)}")
+    
+    def parse_upload(self, upload):
+        """Extract and parse text from an upload produced by read_upload"""
+        filename = upload['filename']
+        budget = self._extraction_budget()
+        
+        # Extract text based on file type
         try:
-            # Save uploaded file temporarily
-            filename = file.filename
-            file_path = os.path.join('uploads', filename)
-            file.save(file_path)
-            
-            # Extract text based on file type
             if filename.lower().endswith('.pdf'):
-                text = self._extract_text_from_pdf(file_path)
+                text = self._extract_text_from_pdf(upload, budget)
             elif filename.lower().endswith(('.docx', '.doc')):
-                text = self._extract_text_from_docx(file_path)
+                text = self._extract_text_from_docx(upload, budget)
             else:
                 return {
                     'success': False,
                     'message': 'Unsupported file format. Please upload PDF or DOCX files.'
                 }
-            
-            # Clean up temporary file
-            os.remove(file_path)
-            
-            if not text.strip():
-                return {
-                    'success': False,
-                    'message': 'Could not extract text from the resume. Please check the file.'
-                }
-            
-            # Parse the extracted text
-            parsed_data = self._parse_resume_text(text)
-            
+        except DocumentLimitExceeded as e:
+            logger.warning(f"Resume {filename} rejected: {str(e)}")
             return {
-                'success': True,
-                'data': parsed_data
+                'success': False,
+                'message': str(e)
             }
-            
-        except Exception as e:
-            logger.error(f"Resume parsing error: {str(e)}")
+        
+        if not text.strip():
             return {
                 'success': False,
-                'message': 'Failed to parse resume',
-                'error': str(e)
+                'message': 'Could not extract text from the resume. Please check the file.'
             }
+        
+        # Parse the extracted text
+        parsed_data = self._parse_resume_text(text)
+        parsed_data['truncated'] = budget.truncated
+        if budget.truncated:
+            logger.warning(f"Resume {filename} truncated to {self.max_pages} pages / {self.max_text_chars} characters")
+        
+        return {
+            'success': True,
+            'data': parsed_data
+        }
+    
+    def is_supported(self, filename):
+        """Check the upload extension before reading any bytes"""
+        return bool(filename) and filename.lower().endswith(('.pdf', '.docx', '.doc'))
+    
+    def _extraction_budget(self):
+        return _ExtractionBudget(self.max_pages, self.max_text_chars, self.extraction_time_budget)
     
-    def _extract_text_from_pdf(self, file_path):
-        """Extract text from PDF file"""
+    def _extract_text_from_pdf(self, upload, budget=None):
+        """Extract text from PDF upload, page by page within the extraction budget"""
+        budget = budget or self._extraction_budget()
         try:
-            doc = fitz.open(file_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            doc.close()
-            return text
+            with _open_pdf(upload) as doc:
+                page_count = budget.pages(doc.page_count)
+                if self.pdf_workers > 1 and page_count >= self.pdf_parallel_min_pages:
+                    page_texts = self._extract_pdf_pages_parallel(upload, page_count, budget)
+                    return ''.join([budget.take(page_text) for page_text in page_texts])
+                
+                page_texts = []
+                for number in range(page_count):
+                    budget.check_time()
+                    page_texts.append(budget.take(_page_text(doc[number], self.pdf_layout)))
+                    if budget.exhausted:
+                        break
+                return ''.join(page_texts)
+        except DocumentLimitExceeded:
+            raise
         except Exception as e:
             logger.error(f"PDF extraction error: {str(e)}")
             return ""
     
-    def _extract_text_from_docx(self, file_path):
-        """Extract text from DOCX file"""
+    def _extract_pdf_pages_parallel(self, upload, page_count, budget):
+        """Extract page texts of a large PDF in contiguous page ranges on the page pool"""
+        chunk_size = -(-page_count // min(self.pdf_workers, page_count))
+        source = {'path': upload['path'], 'data': upload['data']}
+        time_limit = budget.remaining_time()
+        
+        executor = _get_page_executor(self.pdf_workers)
         try:
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            futures = [
+                executor.submit(_pdf_page_texts, source, start, min(start + chunk_size, page_count),
+                                self.pdf_layout, time_limit)
+                for start in range(0, page_count, chunk_size)
+            ]
+            wait = time_limit + PAGE_TIMEOUT_GRACE if time_limit is not None else None
+            deadline = time.monotonic() + wait if wait is not None else None
+            return [
+                text for future in futures
+                for text in future.result(timeout=max(deadline - time.monotonic(), 0) if deadline else None)
+            ]
+        except FutureTimeoutError:
+            # A worker stuck in native code stops at its alarm once it returns to Python
+            for future in futures:
+                future.cancel()
+            raise DocumentLimitExceeded(f'Text extraction exceeded the {budget.time_budget:g}s time budget')
+        except DocumentLimitExceeded:
+            for future in futures:
+                future.cancel()
+            raise
+        except BrokenProcessPool:
+            _reset_page_executor(executor)
+            raise
+    
+    def _extract_text_from_docx(self, upload, budget=None):
+        """Extract text from DOCX upload (headers, body, tables, text boxes, footers) within the extraction budget"""
+        budget = budget or self._extraction_budget()
+        try:
+            with zipfile.ZipFile(upload['path'] or io.BytesIO(upload['data'])) as archive:
+                self._check_docx_archive(archive)
+                
+                paragraphs = []
+                for paragraph in iter_docx_paragraphs(archive):
+                    budget.check_time()
+                    paragraphs.append(budget.take(paragraph + "\n"))
+                    if budget.exhausted:
+                        break
+                return ''.join(paragraphs)
+        except DocumentLimitExceeded:
+            raise
         except Exception as e:
             logger.error(f"DOCX extraction error: {str(e)}")
             return ""
     
+    def _check_docx_archive(self, archive):
+        """Reject DOCX archives that would unpack past max_unpacked_bytes (zip bombs)"""
+        if not self.max_unpacked_bytes:
+            return
+        # zipfile stops reading a member at its declared size, so the declared sizes bound the work
+        unpacked = sum(member.file_size for member in archive.infolist())
+        if unpacked > self.max_unpacked_bytes:
+            raise DocumentLimitExceeded(f'Document unpacks to {unpacked / (1024 * 1024):.0f} MB, over the '
+                                        f'{self.max_unpacked_bytes / (1024 * 1024):g} MB limit')
+    
     def _parse_resume_text(self, text):
         """Parse resume text and extract structured information"""
         # Basic text preprocessing
         lines = [line.strip() for line in text.split('\n') if line.strip()]
         
+        # Tag lines with their section once; the entry extractors only walk their spans
+        spans = self._segment_sections(lines)
+        
         # Extract different sections
         personal_info = self._extract_personal_info(text)
-        education = self._extract_education(text, lines)
-        experience = self._extract_experience(text, lines)
+        education = self._extract_education(lines, spans)
+        experience = self._extract_experience(lines, spans)
         skills = self._extract_skills(text)
         
-        # Perform text analysis
-        text_analysis = self._analyze_text_quality(text)
-        
-        # Calculate readability scores
-        readability = self._calculate_readability(text)
+        # Text statistics and readability scores
+        text_analysis, readability = self._analyze_text(text)
         
         # Extract key metrics
         metrics = self._extract_metrics(text)
@@ -155,15 +493,13 @@ class ResumeParser:
         """Extract personal information using regex and NLP"""
         personal_info = {}
         
-        # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        personal_info['email'] = emails[0] if emails else None
+        # Extract email (only the first match is used, so stop scanning there)
+        email = patterns.EMAIL.search(text)
+        personal_info['email'] = email.group(0) if email else None
         
         # Extract phone number
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phones = re.findall(phone_pattern, text)
-        personal_info['phone'] = ''.join(phones[0]) if phones else None
+        phone = patterns.PHONE.search(text)
+        personal_info['phone'] = phone.group(0) if phone else None
         
         # Extract name (first few words, likely to be name)
         lines = text.split('\n')
@@ -176,83 +512,109 @@ class ResumeParser:
                     break
         
         # Extract LinkedIn
-        linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-        linkedin = re.findall(linkedin_pattern, text, re.IGNORECASE)
-        personal_info['linkedin'] = linkedin[0] if linkedin else None
+        linkedin = patterns.LINKEDIN.search(text)
+        personal_info['linkedin'] = linkedin.group(0) if linkedin else None
         
         return personal_info
     
-    def _extract_education(self, text, lines):
-        """Extract education information"""
-        education = []
-        education_section = False
+    def _section_header(self, line):
+        """Section a line opens if it is a header, else None"""
+        if len(line) > patterns.SECTION_HEADER_MAX_LENGTH or '@' in line or any(char.isdigit() for char in line):
+            return None
+        match = patterns.SECTION_HEADER.fullmatch(line.strip())
+        return patterns.SECTION_HEADERS[match.group(1).lower()] if match else None
+    
+    def _segment_sections(self, lines):
+        """Split lines into (section, start, end) spans in one pass; header lines are excluded"""
+        spans = []
+        section, start = 'header', 0
         
         for i, line in enumerate(lines):
-            line_lower = line.lower()
-            
-            # Check if we're entering education section
-            if any(keyword in line_lower for keyword in ['education', 'academic', 'qualification']):
-                education_section = True
-                continue
-            
-            # Check if we're leaving education section
-            if education_section and any(keyword in line_lower for keyword in self.experience_keywords):
-                education_section = False
-            
-            # Extract education entries
-            if education_section or any(keyword in line_lower for keyword in self.education_keywords):
-                degree_match = re.search(r'(bachelor|master|phd|b\.?[as]|m\.?[as]|ph\.?d)', line_lower)
-                if degree_match:
-                    education_entry = {
-                        'degree': line,
-                        'institution': self._find_institution(lines, i),
-                        'year': self._extract_year(line)
-                    }
-                    education.append(education_entry)
+            next_section = self._section_header(line)
+            if next_section:
+                if i > start:
+                    spans.append((section, start, i))
+                section, start = next_section, i + 1
+        
+        if len(lines) > start:
+            spans.append((section, start, len(lines)))
+        return spans
+    
+    def _extract_education(self, lines, spans):
+        """Extract education entries from the education sections"""
+        education = []
+        education_spans = [(start, end) for section, start, end in spans if section == 'education']
+        
+        # Without an education header, fall back to lines that mention schools or degrees,
+        # searched section by section so header lines are skipped and institutions stay in their section
+        headerless = not education_spans
+        if headerless:
+            education_spans = [(start, end) for _, start, end in spans]
+        
+        for start, end in education_spans:
+            for i in range(start, end):
+                line_lower = lines[i].lower()
+                if headerless and not any(keyword in line_lower for keyword in self.education_keywords):
+                    continue
+                
+                if patterns.DEGREE.search(line_lower):
+                    institution = self._find_institution(lines, i, start, end)
+                    education.append({
+                        'degree': lines[i],
+                        'institution': institution,
+                        'year': self._extract_year(lines[i]) or (self._extract_year(institution) if institution else None)
+                    })
         
         return education
     
-    def _extract_experience(self, text, lines):
-        """Extract work experience"""
+    def _extract_experience(self, lines, spans):
+        """Extract work experience entries from the experience sections"""
         experience = []
-        experience_section = False
+        experience_spans = [(start, end) for section, start, end in spans if section == 'experience']
         
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
-            
-            # Check if we're entering experience section
-            if any(keyword in line_lower for keyword in self.experience_keywords):
-                experience_section = True
-                continue
+        # Without an experience header, only job-title lines can start an entry; entries are
+        # searched section by section so descriptions stop at the next header
+        headerless = not experience_spans
+        if headerless:
+            experience_spans = [(start, end) for _, start, end in spans]
+        
+        for start, end in experience_spans:
+            entry = None
+            description = []
+            for i in range(start, end):
+                line = lines[i]
+                
+                # A job title (or the first line of the section) starts a new entry
+                if self._is_job_title(line) or (entry is None and not headerless):
+                    if entry is not None:
+                        entry['description'] = ' '.join(description)
+                    entry = {'title': line, 'company': None, 'duration': self._extract_duration(line), 'description': ''}
+                    description = []
+                    experience.append(entry)
+                elif entry is None:
+                    continue
+                elif entry['company'] is None and not description:
+                    entry['company'] = line
+                    entry['duration'] = entry['duration'] or self._extract_duration(line)
+                elif len(description) < self.MAX_DESCRIPTION_LINES:
+                    description.append(line)
             
-            # Extract job titles and companies
-            if experience_section or self._is_job_title(line):
-                job_entry = {
-                    'title': line,
-                    'company': self._find_company(lines, i),
-                    'duration': self._extract_duration(line),
-                    'description': self._extract_job_description(lines, i)
-                }
-                experience.append(job_entry)
+            if entry is not None:
+                entry['description'] = ' '.join(description)
         
         return experience
     
     def _extract_skills(self, text):
         """Extract skills using keyword matching and NLP"""
-        text_lower = text.lower()
-        found_skills = []
-        
-        # Technical skills from database
-        for skill in self.skills_database:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
+        # Technical skills from database (single pass, whole words only)
+        found_skills = self.skill_matcher.find(text)
         
         # Extract skills from skills section
-        skills_section = re.search(r'skills?\s*:?\s*(.*?)(?=\n\s*\n|\n[A-Z]|$)', text, re.IGNORECASE | re.DOTALL)
+        skills_section = patterns.SKILLS_SECTION.search(text)
         if skills_section:
             skills_text = skills_section.group(1)
             # Split by common delimiters
-            skills_list = re.split(r'[,;•\n\t]+', skills_text)
+            skills_list = patterns.SKILL_DELIMITERS.split(skills_text)
             for skill in skills_list:
                 skill = skill.strip()
                 if skill and len(skill) < 50:  # Reasonable skill length
@@ -260,8 +622,22 @@ class ResumeParser:
         
         return list(set(found_skills))  # Remove duplicates
     
-    def _analyze_text_quality(self, text):
-        """Analyze text quality using NLP"""
+    def _analyze_text(self, text):
+        """Return (text_analysis, readability) from the configured statistics engine"""
+        if self.text_stats_engine == 'nltk':
+            return self._analyze_text_quality_nltk(text), self._calculate_readability(text)
+        
+        # One tokenization pass yields the counts behind both results
+        if self.pos_tagging:
+            ensure_nltk_resources()
+        return analyze_text(text, self.stop_words, get_pos_tagger() if self.pos_tagging else None)
+    
+    def _analyze_text_quality_nltk(self, text):
+        """Analyze text quality using NLTK's tokenizers and pos_tag"""
+        ensure_nltk_resources()
+        from nltk.tokenize import word_tokenize, sent_tokenize
+        from nltk.tag import pos_tag
+        
         # Tokenize and analyze
         sentences = sent_tokenize(text)
         words = word_tokenize(text.lower())
@@ -289,9 +665,11 @@ class ResumeParser:
         return analysis
     
     def _calculate_readability(self, text):
-        """Calculate readability scores"""
+        """Calculate readability scores with textstat"""
+        import textstat
+        
         return {
-            'flesch_kincaid_grade': textstat.flesch_kincaid().grade(text),
+            'flesch_kincaid_grade': textstat.flesch_kincaid_grade(text),
             'flesch_reading_ease': textstat.flesch_reading_ease(text),
             'gunning_fog': textstat.gunning_fog(text),
             'automated_readability_index': textstat.automated_readability_index(text)
@@ -301,70 +679,39 @@ class ResumeParser:
         """Extract quantifiable metrics from resume"""
         metrics = []
         
-        # Look for numbers followed by units or descriptors
-        metric_patterns = [
-            r'\$?(\d+(?:,\d{3})*(?:\.\d+)?)\s*(million|billion|k|thousand|%|percent)',
-            r'(\d+(?:\.\d+)?)\s*(years?|months?|weeks?)',
-            r'(\d+)(?:\+|\s+or\s+more|\s+plus)?\s*(people|team|members|employees)',
-            r'improved?\s+by\s+(\d+(?:\.\d+)?)(%|percent|times|x)',
-            r'increased?\s+by\s+(\d+(?:\.\d+)?)(%|percent|times|x)',
-            r'reduced?\s+by\s+(\d+(?:\.\d+)?)(%|percent|times|x)'
-        ]
-        
-        for pattern in metric_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    metrics.append(' '.join(match))
-                else:
-                    metrics.append(match)
+        # One scan over the merged metric patterns; matches come back in text order.
+        # Each alternative has two groups, so the last matched group closes the pair.
+        for match in patterns.METRIC.finditer(text):
+            metrics.append(' '.join(match.group(match.lastindex - 1, match.lastindex)))
         
         return metrics
     
-    def _find_institution(self, lines, index):
-        """Find institution name near education entry"""
-        # Look in nearby lines for institution
-        for i in range(max(0, index-2), min(len(lines), index+3)):
-            if any(keyword in lines[i].lower() for keyword in self.education_keywords):
-                return lines[i]
-        return None
-    
-    def _find_company(self, lines, index):
-        """Find company name near job entry"""
-        # Look in nearby lines for company
-        for i in range(max(0, index-1), min(len(lines), index+2)):
-            if i != index and lines[i].strip():
+    def _find_institution(self, lines, index, start, end):
+        """Find the institution named on or nearest to an education entry within its span"""
+        for offset in (0, 1, -1, 2, -2):
+            i = index + offset
+            if start <= i < end and patterns.INSTITUTION.search(lines[i]):
                 return lines[i]
         return None
     
     def _extract_year(self, text):
         """Extract year from text"""
-        year_pattern = r'(19|20)\d{2}'
-        years = re.findall(year_pattern, text)
-        return years[-1] + years[-1][2:] if years else None
+        years = patterns.YEAR.findall(text)
+        return years[-1] if years else None
     
     def _extract_duration(self, text):
         """Extract duration from text"""
-        duration_pattern = r'(\d{4})\s*[-–]\s*(\d{4}|present|current)'
-        duration = re.search(duration_pattern, text, re.IGNORECASE)
+        duration = patterns.DURATION.search(text)
         return duration.group(0) if duration else None
     
     def _is_job_title(self, line):
         """Determine if line is likely a job title"""
+        # Bullet points mention roles too ("Managed a team of engineers"); titles are short
+        if len(line) > self.MAX_JOB_TITLE_LENGTH:
+            return False
         job_keywords = ['engineer', 'developer', 'manager', 'analyst', 'specialist', 'coordinator', 'director', 'lead', 'senior', 'junior']
         return any(keyword in line.lower() for keyword in job_keywords)
     
-    def _extract_job_description(self, lines, index):
-        """Extract job description following the job title"""
-        description = []
-        for i in range(index + 1, min(len(lines), index + 5)):
-            line = lines[i].strip()
-            if line and not self._is_job_title(line):
-                description.append(line)
-            else:
-                break
-        return ' '.join(description)
-    
     def _load_skills_database(self):
         """Load comprehensive skills database"""
         # Technical skills database
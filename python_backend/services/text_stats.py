@@ -0,0 +1,133 @@
+import re
+import logging
+import threading
+from collections import Counter
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+TEXT_STATS_ENGINES = ('fast', 'nltk')
+
+# Approximates NLTK's Treebank tokenization: contractions are split ("do", "n't"),
+# dotted and hyphenated words stay whole ("node.js", "e-mail"), and every other
+# punctuation character is its own token
+WORD_PATTERN = re.compile(r"""
+    \w+(?=n't\b)
+  | n't\b
+  | '(?:s|m|d|ll|re|ve)\b
+  | (?:\+(?=\d))?\w+(?:[-./+]\w+)*\+*
+  | \.\.\.
+  | [^\w\s]
+""", re.VERBOSE)
+
+# A sentence ends at . ! or ? (plus closing quotes/brackets) followed by whitespace
+# and a capital, digit or opening quote, like Punkt without learned abbreviations
+SENTENCE_BOUNDARY = re.compile(r"""(?<=[.!?])["')\]]*\s+(?=["'(\[]?[A-Z0-9])""")
+
+VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+NON_LETTERS = re.compile(r'[^a-z]+')
+SILENT_ENDING = re.compile(r'(?:[^aeiouy]e|[^aeiouytd]ed|[^aeiouy]es)$')
+
+_pos_tagger = None
+_pos_tagger_lock = threading.Lock()
+
+
+def get_pos_tagger():
+    """Averaged perceptron tagger, unpickled once per process
+
+    nltk.pos_tag builds a new PerceptronTagger, and loads its model from disk, on every call.
+    """
+    global _pos_tagger
+    if _pos_tagger is None:
+        with _pos_tagger_lock:
+            if _pos_tagger is None:
+                from nltk.tag.perceptron import PerceptronTagger
+                _pos_tagger = PerceptronTagger()
+    return _pos_tagger
+
+
+def count_sentences(text):
+    """Number of sentences in text; 0 for blank text"""
+    if not text.strip():
+        return 0
+    return len(SENTENCE_BOUNDARY.split(text.strip()))
+
+
+def tokenize_words(text):
+    """Lowercased word and punctuation tokens"""
+    return WORD_PATTERN.findall(text.lower())
+
+
+@lru_cache(maxsize=65536)
+def count_syllables(word):
+    """Estimated English syllables in a lowercased word, memoized across documents"""
+    syllables = len(VOWEL_GROUPS.findall(word))
+    # A trailing silent e/ed/es does not add a syllable ("make", "jumped", "makes"),
+    # except after an l-consonant cluster ("table")
+    if syllables > 1 and SILENT_ENDING.search(word) and not word.endswith('le'):
+        syllables -= 1
+    return max(syllables, 1)
+
+
+def readability_scores(sentences, words, syllables, polysyllables, characters):
+    """Flesch-Kincaid grade, Flesch reading ease, Gunning fog and ARI from document totals"""
+    if not words:
+        return {
+            'flesch_kincaid_grade': 0.0,
+            'flesch_reading_ease': 0.0,
+            'gunning_fog': 0.0,
+            'automated_readability_index': 0.0
+        }
+
+    words_per_sentence = words / max(sentences, 1)
+    syllables_per_word = syllables / words
+
+    return {
+        'flesch_kincaid_grade': round(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, 1),
+        'flesch_reading_ease': round(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 2),
+        'gunning_fog': round(0.4 * (words_per_sentence + 100 * polysyllables / words), 2),
+        'automated_readability_index': round(4.71 * characters / words + 0.5 * words_per_sentence - 21.43, 1)
+    }
+
+
+def analyze_text(text, stop_words, tagger=None):
+    """Text statistics and readability from a single tokenization pass
+
+    Returns (text_analysis, readability) with the same fields as the NLTK/textstat path of
+    ResumeParser; pos_distribution is empty when no tagger is given.
+    """
+    sentence_count = count_sentences(text)
+    tokens = tokenize_words(text)
+
+    # Resumes repeat most tokens, so work per distinct token, weighted by its count
+    unique_words = filtered_words = 0
+    words = syllables = polysyllables = characters = 0
+    for token, occurrences in Counter(tokens).items():
+        # Punctuation and split-off clitics ("n't", "'s") are tokens but not words
+        if not token[0].isalnum() or token == "n't":
+            continue
+
+        words += occurrences
+        characters += len(token) * occurrences
+        if token.isalpha():
+            token_syllables = count_syllables(token)
+            if token not in stop_words:
+                unique_words += 1
+                filtered_words += occurrences
+        else:
+            # Numbers and compounds such as "node.js" or "e-mail": syllables of their letter runs
+            token_syllables = sum(count_syllables(part) for part in NON_LETTERS.split(token) if part) or 1
+        syllables += token_syllables * occurrences
+        if token_syllables >= 3:
+            polysyllables += occurrences
+
+    text_analysis = {
+        'word_count': len(tokens),
+        'sentence_count': sentence_count,
+        'unique_words': unique_words,
+        'avg_sentence_length': len(tokens) / sentence_count if sentence_count else 0,
+        'vocabulary_richness': unique_words / filtered_words if filtered_words else 0,
+        'pos_distribution': dict(Counter(tag for _, tag in tagger.tag(tokens))) if tagger and tokens else {}
+    }
+
+    return text_analysis, readability_scores(sentence_count, words, syllables, polysyllables, characters)
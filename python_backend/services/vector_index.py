@@ -0,0 +1,302 @@
+import os
+import json
+import logging
+import threading
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeVectorIndex:
+    """Persisted sparse vector index of resume texts for ranking against job descriptions
+
+    Documents are hashed (no fitted vocabulary), so the index grows one resume at a
+    time without refitting. Rows hold l2-normalized log term frequencies; IDF weights
+    come from running document frequencies and are applied to the query side. Every
+    row records the user who owns the analysis, and searches only rank that user's rows.
+    """
+
+    def __init__(self, index_path='models/resume_index', n_features=2 ** 18, flush_every=100):
+        self.index_path = index_path
+        self.flush_every = flush_every
+        self.n_features = n_features
+        self._vectorizer = None
+
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._reset()
+        # Only an index loaded from disk or rebuilt from the collection reflects every stored
+        # analysis; until then additions are kept in memory but never saved
+        self._complete = False
+        # Additions made while a rebuild reads the collection, replayed onto the rebuilt index
+        self._rebuild_additions = None
+
+        self._flush_requested = threading.Event()
+        self._flusher = None
+
+    def _reset(self):
+        self._matrix = sparse.csr_matrix((0, self.n_features), dtype=np.float32)
+        self._pending = []
+        self._ids = []
+        self._owners = []
+        self._owner_rows = {}
+        self._document_frequency = np.zeros(self.n_features, dtype=np.int64)
+        self._unsaved = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def count(self, owner):
+        """Number of indexed resumes owned by owner"""
+        return len(self._owner_rows.get(str(owner), ()))
+
+    @property
+    def vectorizer(self):
+        """HashingVectorizer, built on first use to keep scikit-learn off the import path"""
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._vectorizer = HashingVectorizer(
+                n_features=self.n_features,
+                alternate_sign=False,
+                norm=None,
+                stop_words='english',
+                dtype=np.float32
+            )
+        return self._vectorizer
+
+    def _vectorize(self, texts):
+        """Sublinear term frequencies, l2-normalized per document"""
+        from sklearn.preprocessing import normalize
+
+        matrix = self.vectorizer.transform(texts)
+        matrix.data = np.log1p(matrix.data)
+        return normalize(matrix)
+
+    def _vectorize_documents(self, analysis_ids, texts, owners):
+        """(ids, owners, rows) for the documents that have text"""
+        documents = [
+            (str(analysis_id), text, str(owner) if owner is not None else None)
+            for analysis_id, text, owner in zip(analysis_ids, texts, owners)
+            if text and text.strip()
+        ]
+        if not documents:
+            return [], [], None
+        rows = self._vectorize([text for _, text, _ in documents])
+        return [analysis_id for analysis_id, _, _ in documents], [owner for _, _, owner in documents], rows
+
+    def add(self, analysis_id, text, owner):
+        """Index one resume owned by owner (the analysis' user_id)"""
+        self.add_many([analysis_id], [text], [owner])
+
+    def add_many(self, analysis_ids, texts, owners):
+        """Index a batch of resumes with one vectorizer call; saving happens on a background thread"""
+        ids, owners, rows = self._vectorize_documents(analysis_ids, texts, owners)
+        if not ids:
+            return
+
+        with self._lock:
+            self._append(ids, owners, rows)
+            if self._rebuild_additions is not None:
+                self._rebuild_additions.append((ids, owners, rows))
+            if self._complete and self._unsaved >= self.flush_every:
+                self._request_flush()
+
+    def _append(self, ids, owners, rows):
+        """Add vectorized rows; the caller holds the lock"""
+        start = len(self._ids)
+        self._pending.append(rows)
+        self._ids.extend(ids)
+        self._owners.extend(owners)
+        for offset, owner in enumerate(owners):
+            self._owner_rows.setdefault(owner, []).append(start + offset)
+        np.add.at(self._document_frequency, rows.indices, 1)
+        self._unsaved += len(ids)
+
+    def _consolidated_matrix(self):
+        with self._lock:
+            if self._pending:
+                self._matrix = sparse.vstack([self._matrix] + self._pending, format='csr')
+                self._pending = []
+            return self._matrix
+
+    def search(self, query_text, owner, top_k=10):
+        """Return [(analysis_id, cosine score)] of owner's best-matching resumes, best first"""
+        with self._lock:
+            matrix = self._consolidated_matrix()
+            rows = np.array(self._owner_rows.get(str(owner), []), dtype=np.int64)
+            ids = [self._ids[row] for row in rows]
+            document_count = len(self._ids)
+            document_frequency = self._document_frequency
+
+        if not len(rows):
+            return []
+
+        from sklearn.preprocessing import normalize
+
+        # Weight the query by IDF so rare, specific terms dominate the ranking
+        query = self.vectorizer.transform([query_text])
+        query.data = np.log1p(query.data) * (
+            np.log((1 + document_count) / (1 + document_frequency[query.indices])) + 1
+        ).astype(np.float32)
+        query = normalize(query)
+
+        scores = (matrix[rows] @ query.T).toarray().ravel()
+        top_k = min(top_k, len(rows))
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+        return [(ids[row], round(float(scores[row]), 4)) for row in ranked if scores[row] > 0]
+
+    def save(self):
+        """Write the index atomically to index_path
+
+        The state is snapshotted under the lock and written outside it, so additions and
+        searches never wait for the disk.
+        """
+        with self._save_lock:
+            with self._lock:
+                if not self._complete:
+                    logger.warning("Resume index is incomplete (not loaded or rebuilt), not saving it")
+                    return
+                matrix = self._consolidated_matrix()
+                ids = list(self._ids)
+                owners = list(self._owners)
+                document_frequency = self._document_frequency.copy()
+                saved = self._unsaved
+
+            os.makedirs(self.index_path, exist_ok=True)
+
+            matrix_path = os.path.join(self.index_path, 'matrix.npz')
+            sparse.save_npz(f'{matrix_path}.tmp.npz', matrix, compressed=False)
+            os.replace(f'{matrix_path}.tmp.npz', matrix_path)
+
+            frequency_path = os.path.join(self.index_path, 'document_frequency.npy')
+            np.save(f'{frequency_path}.tmp.npy', document_frequency)
+            os.replace(f'{frequency_path}.tmp.npy', frequency_path)
+
+            # ids are written last so a crash never leaves more ids than matrix rows
+            ids_path = os.path.join(self.index_path, 'ids.json')
+            with open(f'{ids_path}.tmp', 'w') as ids_file:
+                json.dump({'ids': ids, 'owners': owners}, ids_file)
+            os.replace(f'{ids_path}.tmp', ids_path)
+
+            with self._lock:
+                self._unsaved = max(self._unsaved - saved, 0)
+            logger.info(f"Resume index saved with {len(ids)} documents")
+
+    def flush(self):
+        """Save only if documents were added since the last save"""
+        if self._unsaved:
+            self.save()
+
+    def _request_flush(self):
+        """Wake the background flusher, starting it on first use; the caller holds the lock"""
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name='resume-index-flush', daemon=True)
+            self._flusher.start()
+        self._flush_requested.set()
+
+    def _flush_loop(self):
+        while True:
+            self._flush_requested.wait()
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Failed to save resume index: {str(e)}")
+
+    def load(self):
+        """Load a saved index; returns False when none exists"""
+        ids_path = os.path.join(self.index_path, 'ids.json')
+        if not os.path.exists(ids_path):
+            return False
+
+        with open(ids_path) as ids_file:
+            documents = json.load(ids_file)
+        matrix = sparse.load_npz(os.path.join(self.index_path, 'matrix.npz')).tocsr()
+        document_frequency = np.load(os.path.join(self.index_path, 'document_frequency.npy'))
+        ids, owners = documents['ids'], documents['owners']
+
+        with self._lock:
+            self._reset()
+            self._matrix = matrix[:len(ids)]
+            self._ids = ids
+            self._owners = owners
+            for row, owner in enumerate(owners):
+                self._owner_rows.setdefault(owner, []).append(row)
+            self._document_frequency = document_frequency
+            self._complete = True
+
+        logger.info(f"Loaded resume index with {len(ids)} documents")
+        return True
+
+    def is_stale(self, collection):
+        """True when the collection holds a different number of indexed analyses,
+        e.g. after bulk_import.py wrote to the database directly"""
+        return collection.count_documents({'parsed_data.raw_text': {'$exists': True}}) != len(self)
+
+    def rebuild(self, collection, batch_size=1000):
+        """Rebuild the index from every stored analysis with parsed text
+
+        The collection is read without holding the lock, so uploads and searches carry on
+        against the current index; the rebuilt index is swapped in at the end, together with
+        any resumes added meanwhile.
+        """
+        with self._lock:
+            self._rebuild_additions = []
+
+        try:
+            parts, ids, owners = [], [], []
+            document_frequency = np.zeros(self.n_features, dtype=np.int64)
+
+            def add_batch(batch_ids, batch_texts, batch_owners):
+                batch_ids, batch_owners, rows = self._vectorize_documents(batch_ids, batch_texts, batch_owners)
+                if batch_ids:
+                    parts.append(rows)
+                    ids.extend(batch_ids)
+                    owners.extend(batch_owners)
+                    np.add.at(document_frequency, rows.indices, 1)
+
+            cursor = collection.find(
+                {'parsed_data.raw_text': {'$exists': True}},
+                {'parsed_data.raw_text': 1, 'user_id': 1}
+            )
+            batch_ids, batch_texts, batch_owners = [], [], []
+            for document in cursor:
+                batch_ids.append(document['_id'])
+                batch_texts.append(document['parsed_data']['raw_text'])
+                batch_owners.append(document.get('user_id'))
+                if len(batch_ids) >= batch_size:
+                    add_batch(batch_ids, batch_texts, batch_owners)
+                    batch_ids, batch_texts, batch_owners = [], [], []
+            add_batch(batch_ids, batch_texts, batch_owners)
+
+            matrix = sparse.vstack(parts, format='csr') if parts else None
+        except Exception:
+            # The current index stays in place, and stays unsaved if it was incomplete
+            with self._lock:
+                self._rebuild_additions = None
+            raise
+
+        with self._lock:
+            additions, self._rebuild_additions = self._rebuild_additions, None
+            self._reset()
+            if matrix is not None:
+                self._matrix = matrix
+            self._ids = ids
+            self._owners = owners
+            for row, owner in enumerate(owners):
+                self._owner_rows.setdefault(owner, []).append(row)
+            self._document_frequency = document_frequency
+            self._complete = True
+
+            indexed = set(ids)
+            for added_ids, added_owners, rows in additions:
+                keep = [position for position, analysis_id in enumerate(added_ids) if analysis_id not in indexed]
+                if keep:
+                    self._append([added_ids[position] for position in keep],
+                                 [added_owners[position] for position in keep], rows[keep])
+
+        self.save()
+        return len(self)
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from services.data_visualizer import DataVisualizer
+from services.result_cache import ResultCache
+
+ANALYSIS = {
+    'revision': 0,
+    'ml_analysis': {
+        'overall_score': 72,
+        'industry_classification': {
+            'primary_industry': 'technology',
+            'industry_scores': {'technology': 0.8, 'finance': 0.3, 'healthcare': 0.1}
+        }
+    },
+    'gemini_analysis': {
+        'score': 80,
+        'category_scores': {'formatting': 75, 'content': 82, 'keywords': 68}
+    },
+    'parsed_data': {
+        'skills': ['Python', 'React', 'MongoDB', 'Docker'],
+        'experience': [
+            {'title': 'Software Engineer', 'company': 'Acme'},
+            {'title': 'Senior Engineer', 'company': 'Globex'}
+        ],
+        'text_analysis': {'word_count': 420, 'unique_words': 230, 'sentence_count': 28, 'avg_sentence_length': 15}
+    }
+}
+
+
+class DataVisualizerCacheTest(unittest.TestCase):
+    def setUp(self):
+        # The visualizer writes word clouds under the working directory
+        self.working_dir = tempfile.mkdtemp()
+        self.previous_dir = os.getcwd()
+        os.chdir(self.working_dir)
+        self.cache = ResultCache()
+        self.visualizer = DataVisualizer(cache=self.cache)
+
+    def tearDown(self):
+        os.chdir(self.previous_dir)
+        shutil.rmtree(self.working_dir)
+
+    def test_full_visualization_set_is_cached_with_etag(self):
+        visualizations = self.visualizer.get_resume_visualizations('analysis-1', ANALYSIS)
+
+        self.assertNotIn('failed_charts', visualizations)
+        for name in ('score_chart', 'skills_chart', 'radar_chart', 'timeline', 'wordcloud',
+                     'text_metrics', 'industry_fit', 'improvement_areas'):
+            self.assertIsNotNone(visualizations[name], name)
+
+        # The route sets an ETag exactly when the visualizations are complete
+        self.assertTrue(DataVisualizer.complete(visualizations))
+        self.assertEqual(self.visualizer.etag('analysis-1', 0), f'{DataVisualizer.VERSION}-analysis-1-0')
+
+        key = self.cache.make_key('visualizations', DataVisualizer.VERSION, 'analysis-1', 0)
+        self.assertEqual(self.cache.get(key), visualizations)
+
+    def test_failed_chart_is_not_cached(self):
+        self.visualizer._create_radar_chart = lambda category_scores: 1 / 0
+
+        visualizations = self.visualizer.get_resume_visualizations('analysis-2', ANALYSIS)
+
+        self.assertEqual(visualizations['failed_charts'], ['radar_chart'])
+        self.assertFalse(DataVisualizer.complete(visualizations))
+        self.assertIsNone(self.cache.get(self.cache.make_key('visualizations', DataVisualizer.VERSION, 'analysis-2', 0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
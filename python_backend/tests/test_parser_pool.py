@@ -0,0 +1,50 @@
+import os
+import time
+import signal
+import threading
+import unittest
+import multiprocessing
+
+import services.parser_pool as parser_pool_module
+from services.parser_pool import ParserPool
+
+
+def _parse_slowly(upload, parse_timeout):
+    if upload['filename'] == 'slow':
+        time.sleep(30)
+    return {'success': True}
+
+
+@unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), 'parser workers need fork')
+class ParserPoolRecoveryTest(unittest.TestCase):
+    def setUp(self):
+        # Workers are forked, so they run the patched parse function
+        self.original_parse = parser_pool_module._parse_upload_in_worker
+        parser_pool_module._parse_upload_in_worker = _parse_slowly
+        self.pool = ParserPool(workers=1, parse_timeout=10)
+        self.pool.start()
+
+    def tearDown(self):
+        self.pool.shutdown()
+        parser_pool_module._parse_upload_in_worker = self.original_parse
+
+    def _kill_worker(self):
+        os.kill(next(iter(self.pool._executor._processes)), signal.SIGKILL)
+
+    def test_pool_restarts_after_idle_worker_dies(self):
+        self._kill_worker()
+        time.sleep(1)
+
+        self.assertEqual(self.pool.parse_upload({'filename': 'ok'}), {'success': True})
+
+    def test_worker_dying_mid_parse_fails_only_that_upload(self):
+        threading.Timer(0.5, self._kill_worker).start()
+
+        result = self.pool.parse_upload({'filename': 'slow'})
+
+        self.assertFalse(result['success'])
+        self.assertEqual(self.pool.parse_upload({'filename': 'ok'}), {'success': True})
+
+
+if __name__ == '__main__':
+    unittest.main()
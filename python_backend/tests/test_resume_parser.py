@@ -0,0 +1,99 @@
+import unittest
+
+from services.resume_parser import ResumeParser, _reading_order
+
+
+class SectionSegmentationTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = ResumeParser()
+
+    def test_headers(self):
+        headers = {
+            'Education': 'education',
+            'EDUCATION:': 'education',
+            'Educational Background': 'education',
+            'Experience': 'experience',
+            'Professional Experience': 'experience',
+            'Employment History': 'experience',
+            'Experience Summary': 'experience',
+            'Work History': 'experience',
+            'Skills Summary': 'skills',
+            'Technical Skills:': 'skills',
+            'Professional Summary': 'summary',
+            'Career Profile': 'summary',
+            'Honors & Awards': 'other'
+        }
+        for line, section in headers.items():
+            self.assertEqual(self.parser._section_header(line), section, line)
+
+    def test_non_headers(self):
+        for line in ['Skills Development Manager', 'Education Consultant at Acme', 'Experience with Python and Go',
+                     'Summary of 2019 results', 'john@example.com']:
+            self.assertIsNone(self.parser._section_header(line), line)
+
+    def test_sections_split_at_qualified_headers(self):
+        lines = [
+            'Jane Doe',
+            'Educational Background',
+            'Master of Science in Physics',
+            'State University 2015',
+            'Skills Summary',
+            'MATLAB, Python, SQL',
+            'Employment History',
+            'Senior Engineer',
+            'Acme Corp 2016 - present'
+        ]
+        spans = self.parser._segment_sections(lines)
+
+        self.assertEqual(spans, [('header', 0, 1), ('education', 2, 4), ('skills', 5, 6), ('experience', 7, 9)])
+
+        # Skills under a recognised header stay out of Education, so "MA" in "MATLAB" is no degree
+        education = self.parser._extract_education(lines, spans)
+        self.assertEqual([entry['degree'] for entry in education], ['Master of Science in Physics'])
+
+
+
+def _block(x0, y0, x1, text):
+    """PyMuPDF text block tuple: (x0, y0, x1, y1, text, block_no, block_type)"""
+    return (x0, y0, x1, y0 + 14, text, 0, 0)
+
+
+class LayoutReadingOrderTest(unittest.TestCase):
+    WIDTH = 612
+
+    def _texts(self, blocks):
+        return [block[4] for block in _reading_order(blocks, self.WIDTH)]
+
+    def test_right_aligned_dates_follow_their_titles(self):
+        blocks = []
+        for row, (title, date, width) in enumerate([('Senior Engineer', '2019 - Present', 80),
+                                                    ('Engineer', '2016 - 2019', 62),
+                                                    ('Intern', 'Summer 2015', 66),
+                                                    ('Tutor', '2013 - 2014', 62)]):
+            top = 140 + row * 60
+            # The date's top differs slightly from the title's, as with a different font
+            blocks += [_block(540 - width, top + 1, 540, date), _block(72, top, 160, title),
+                       _block(72, top + 16, 200, 'Acme Corp')]
+
+        texts = self._texts(blocks)
+
+        self.assertEqual(texts[:6], ['Senior Engineer', '2019 - Present', 'Acme Corp',
+                                     'Engineer', '2016 - 2019', 'Acme Corp'])
+
+    def test_two_columns_read_left_then_right(self):
+        left = [_block(40, 72 + row * 80, 280, f'left {row}') for row in range(4)]
+        right = [_block(330, 100 + row * 90, 570, f'right {row}') for row in range(4)]
+
+        texts = self._texts(right + left)
+
+        self.assertEqual(texts, [f'left {row}' for row in range(4)] + [f'right {row}' for row in range(4)])
+
+    def test_few_right_blocks_are_not_a_column(self):
+        blocks = [_block(72, 72 + row * 20, 250, f'line {row}') for row in range(5)] + [_block(400, 50, 540, 'Portland, OR')]
+
+        self.assertEqual(self._texts(blocks)[0], 'Portland, OR')
+
+
+if __name__ == '__main__':
+    unittest.main()
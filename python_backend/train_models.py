@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Offline training of the corpus TF-IDF/KMeans models used by MLAnalyzer
+"""
+
+import os
+import sys
+import logging
+import argparse
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+from services.ml_analyzer import MLAnalyzer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def load_corpus(db, limit=0):
+    """Read the raw text of stored resume analyses"""
+    cursor = db.resume_analyses.find(
+        {'parsed_data.raw_text': {'$exists': True}},
+        {'parsed_data.raw_text': 1}
+    ).limit(limit)
+
+    return [document['parsed_data']['raw_text'] for document in cursor]
+
+
+def main():
+    """Main training function"""
+    parser = argparse.ArgumentParser(description='Fit and persist the MLAnalyzer corpus models')
+    parser.add_argument('--clusters', type=int, default=8, help='number of KMeans clusters')
+    parser.add_argument('--limit', type=int, default=0, help='maximum resumes to train on (0 = all)')
+    args = parser.parse_args()
+
+    # Resolve models/ and .env relative to the backend directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    load_dotenv()
+
+    client = MongoClient(os.getenv('MONGO_URI', 'mongodb://localhost:27017/resume_builder_ml'))
+    db = client.get_default_database()
+
+    logger.info("📥 Loading resume corpus from resume_analyses...")
+    texts = load_corpus(db, args.limit)
+    logger.info(f"📄 Loaded {len(texts)} resumes")
+
+    analyzer = MLAnalyzer()
+    models = analyzer.fit_corpus_models(texts, n_clusters=args.clusters)
+    path = analyzer.save_corpus_models()
+
+    logger.info(f"✅ Trained on {models['document_count']} resumes, cluster sizes: {models['cluster_sizes'].tolist()}")
+    logger.info(f"💾 Models written to {path}; restart the backend to load them")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("\n🛑 Training interrupted by user")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"❌ Training failed with error: {e}")
+        sys.exit(1)